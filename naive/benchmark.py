@@ -0,0 +1,500 @@
+import csv
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import naive
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Benchmark helpers
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Usage: python benchmark.py [name ...]
+# Runs every benchmark when no names are given. Statements are separated
+# with '$' so each program fits on one line.
+
+BENCHMARKS = {}
+
+def benchmark(function):
+    BENCHMARKS[function.__name__] = function
+    return function
+
+def time_naive(text, repeat=3, bindings=None, profiler_type=None):
+    # profiler_type, if given, makes a fresh profiler for every run.
+    best = None
+    for _ in range(repeat):
+        profiler = profiler_type and profiler_type()
+        start = time.perf_counter()
+        result, error = naive.run('<benchmark>', text, bindings, profiler)
+        elapsed = time.perf_counter() - start
+        if error:
+            raise Exception(error.as_string())
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def time_python(function, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def report(label, seconds, count=None, unit='iter'):
+    line = f'  {label:<40} {seconds * 1000:10.2f} ms'
+    if count:
+        line += f'   {count / seconds:14,.0f} {unit}/s'
+    print(line)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Benchmarks
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+@benchmark
+def for_loops(n=1_000_000):
+    print(f'for_loops (n={n:,})')
+
+    def python_assign():
+        for i in range(n):
+            x = i
+
+    def python_sum():
+        total = 0
+        for i in range(n):
+            total = total + i
+
+    # A bare literal body is dropped when the loop is parsed, so every loop
+    # here does some work. A float step takes the generic path: a condition
+    # lambda and a new Number per step, as all loops did before the native
+    # range path.
+    report('python: x = i', time_python(python_assign), n)
+    native = time_naive(f'For i = 0 To {n} Then $ Elem x = i $ Ends')
+    generic = time_naive(f'For i = 0 To {n} Step 1.0 Then $ Elem x = i $ Ends')
+    report('naive: Elem x = i (native range)', native, n)
+    report('naive: Elem x = i (generic path)', generic, n)
+    print(f'  {"native range speedup":<40} {generic / native:10.2f} x')
+    report('python: total = total + i', time_python(python_sum), n)
+    native = time_naive(f'Elem total = 0 $ For i = 0 To {n} Then $ Elem total = total + i $ Ends')
+    generic = time_naive(f'Elem total = 0 $ For i = 0 To {n} Step 1.0 Then $ Elem total = total + i $ Ends')
+    report('naive: Elem total = total + i (native range)', native, n)
+    report('naive: Elem total = total + i (generic path)', generic, n)
+    print(f'  {"native range speedup":<40} {generic / native:10.2f} x')
+
+@benchmark
+def list_building(n=1_000_000):
+    print(f'list_building (n={n:,})')
+
+    def python_append():
+        items = []
+        for i in range(n):
+            items.append(i)
+
+    report('python: list.append', time_python(python_append), n)
+    report('naive: Elem l = l + i',
+           time_naive(f'Elem l = [] $ For i = 0 To {n} Then $ Elem l = l + i $ Ends', repeat=1), n)
+    report('naive: Append(l, i)',
+           time_naive(f'Elem l = [] $ For i = 0 To {n} Then $ Append(l, i) $ Ends', repeat=1), n)
+    report('naive: l / i over the built list',
+           time_naive(f'Elem l = For i = 0 To {n} Then i $ For i = 0 To {n} Then $ l / i $ Ends', repeat=1), n)
+
+@benchmark
+def string_building(size_mb=100, piece_size=100):
+    n = size_mb * 1_000_000 // piece_size
+    piece = 'x' * (piece_size - 1) + ','
+    print(f'string_building ({size_mb} MB from {n:,} pieces of {piece_size} chars)')
+
+    def python_join():
+        parts = []
+        for i in range(n):
+            parts.append(piece)
+        return ''.join(parts)
+
+    report('python: list of pieces + join', time_python(python_join, repeat=1), n, 'piece')
+
+    start = time.perf_counter()
+    result, error = naive.run('<benchmark>',
+        f'Elem s = "" $ For i = 0 To {n} Then $ Elem s = s + "{piece}" $ Ends $ s')
+    built = time.perf_counter() - start
+    if error:
+        raise Exception(error.as_string())
+    report('naive: Elem s = s + piece', built, n, 'piece')
+
+    start = time.perf_counter()
+    length = len(str(result.elements[-1]))
+    report(f'naive: join on first read ({length:,} chars)', time.perf_counter() - start)
+
+@benchmark
+def binary_operations(n=300_000):
+    print(f'binary_operations (n={n:,})')
+    programs = [
+        ('arithmetic: t = t + i * 2 - 1',
+         f'Elem t = 0 $ For i = 0 To {n} Then $ Elem t = t + i * 2 - 1 $ Ends'),
+        ('comparison: c = i < 10 Or i >= 20',
+         f'For i = 0 To {n} Then $ Elem c = i < 10 Or i >= 20 $ Ends'),
+        ('strings: s = "a" + "b"',
+         f'For i = 0 To {n} Then $ Elem s = "a" + "b" $ Ends'),
+    ]
+    for label, text in programs:
+        naive.Interpreter.inline_caches = False
+        uncached = time_naive(text)
+        naive.Interpreter.inline_caches = True
+        cached = time_naive(text)
+        report(f'{label} (no cache)', uncached, n)
+        report(f'{label} (inline cache)', cached, n)
+        print(f'  {"inline cache speedup":<40} {uncached / cached:10.2f} x')
+
+@benchmark
+def function_calls(n=1_000_000):
+    print(f'function_calls (n={n:,})')
+
+    def python_calls():
+        f = lambda x: x
+        for i in range(n):
+            f(i)
+
+    report('python: f(i)', time_python(python_calls), n, 'call')
+    report('naive: f(i) with f(x) => x',
+           time_naive(f'Define f(x) => x $ For i = 0 To {n} Then $ f(i) $ Ends', repeat=1), n, 'call')
+    report('naive: add(i, 1) with add(a, b) => a + b',
+           time_naive(f'Define add(a, b) => a + b $ For i = 0 To {n} Then $ add(i, 1) $ Ends', repeat=1), n, 'call')
+    report('naive: IsNumber(i) built-in',
+           time_naive(f'For i = 0 To {n} Then $ IsNumber(i) $ Ends', repeat=1), n, 'call')
+
+    @naive.builtin('BenchmarkIdentity')
+    def identity(value):
+        return value
+
+    report('naive: registered native built-in',
+           time_naive(f'For i = 0 To {n} Then $ BenchmarkIdentity(i) $ Ends', repeat=1), n, 'call')
+
+@benchmark
+def arrays(n=1_000_000):
+    print(f'arrays (n={n:,})')
+    report('naive scalar: sum of i * i in a For loop',
+           time_naive(f'Elem t = 0 $ For i = 0 To {n} Then $ Elem t = t + i * i $ Ends $ t', repeat=1), n, 'elem')
+    report('naive Array: ArraySum(a * a)',
+           time_naive(f'Elem a = ArrayRange(0, {n}) $ ArraySum(a * a)'), n, 'elem')
+    report('naive scalar: l = [i * 2 + 1 ...] via For',
+           time_naive(f'Elem l = For i = 0 To {n} Then i * 2 + 1 $ 0', repeat=1), n, 'elem')
+    report('naive Array: a * 2 + 1',
+           time_naive(f'Elem a = ArrayRange(0, {n}) $ Elem b = a * 2 + 1 $ 0'), n, 'elem')
+    report('naive Array: ToArray/ToList round trip',
+           time_naive(f'Elem l = For i = 0 To {n} Then i $ ToList(ToArray(l)) $ 0', repeat=1), n, 'elem')
+
+@benchmark
+def embedding(n=1_000_000):
+    print(f'embedding (n={n:,})')
+    items = list(range(n))
+    data = naive.numpy.arange(n, dtype=float) if naive.numpy is not None else None
+
+    def round_trip(text, bindings):
+        start = time.perf_counter()
+        result = naive.evaluate(text, bindings)
+        return time.perf_counter() - start, result
+
+    seconds, result = round_trip('l', {'l': items})
+    report(f'list in and out (shared: {result is items})', seconds, n, 'elem')
+    seconds, result = round_trip('l / 12345', {'l': items})
+    report('list in, one element read', seconds, n, 'elem')
+    seconds, result = round_trip('l + 0', {'l': items})
+    report('list in, appended copy out', seconds, n, 'elem')
+    if data is not None:
+        seconds, result = round_trip('a', {'a': data})
+        report(f'ndarray in and out (shared: {result is data})', seconds, n, 'elem')
+        seconds, result = round_trip('ArraySum(a * 2)', {'a': data})
+        report('ndarray in, ArraySum(a * 2) out', seconds, n, 'elem')
+
+@benchmark
+def maps(n=500):
+    print(f'maps (n={n:,} keys, n lookups)')
+    report('naive: scan a list of [key, value] pairs',
+           time_naive(f'Elem p = For i = 0 To {n} Then [i, i] $ '
+                      f'For k = 0 To {n} Then $ Elem j = 0 $ While (p / j) / 0 != k Then Elem j = j + 1 $ Ends', repeat=1), n, 'lookup')
+    report('naive: m / key on a Map',
+           time_naive(f'Elem m = {{}} $ For i = 0 To {n} Then $ MapSet(m, i, i) $ Ends $ '
+                      f'For k = 0 To {n} Then $ m / k $ Ends', repeat=1), n, 'lookup')
+
+@benchmark
+def records(n=1_000_000):
+    print(f'records (n={n:,} rows)')
+    layouts = [
+        ('list rows [id, score]', '0', '[i, i * 2]', '(rows / i) / 1'),
+        ('Record rows Row(id, score)', 'Record Row(id, score)', 'Row(i, i * 2)', '(rows / i).score'),
+    ]
+    for label, declaration, row, access in layouts:
+        build = f'{declaration} $ Elem rows = For i = 0 To {n} Then {row}'
+        built = time_naive(f'{build} $ 0', repeat=1)
+        report(f'{label}: build', built, n, 'row')
+
+        # Memory still held by the rows once the program has finished.
+        tracemalloc.start()
+        result, error = naive.run('<benchmark>', build, {})
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        print(f'  {label + ": memory":<40} {size / 1_000_000:10.1f} MB   {size / n:14,.0f} bytes/row')
+
+        read = time_naive(f'{build} $ For i = 0 To {n} Then $ {access} $ Ends', repeat=1) - built
+        report(f'{label}: read one field', read, n, 'row')
+
+@benchmark
+def bulk_builtins(n=1_000_000):
+    print(f'bulk_builtins (n={n:,})')
+    build = f'Elem l = For i = 0 To {n} Then {n} - i'
+    built = time_naive(f'{build} $ 0', repeat=1)
+    programs = [
+        ('length: While loop over l / i',
+         'Elem c = 0 $ While c < ' + str(n) + ' Then $ l / c $ Elem c = c + 1 $ Ends'),
+        ('length: Len(l)', 'Len(l)'),
+        ('sum: For loop', f'Elem t = 0 $ For i = 0 To {n} Then $ Elem t = t + l / i $ Ends'),
+        ('sum: Sum(l)', 'Sum(l)'),
+        ('sort: Sort(l)', 'Sort(l)'),
+        ('search: Contains(Sort(l), 7)', 'Contains(Sort(l), 7)'),
+    ]
+    for label, text in programs:
+        report(label, time_naive(f'{build} $ {text}', repeat=1) - built, n, 'elem')
+
+@benchmark
+def higher_order(n=300_000):
+    print(f'higher_order (n={n:,})')
+    build = f'Elem l = For i = 0 To {n} Then i $ Define sq(x) => x * x $ Define big(x) => x > {n // 2} $ Define add(a, b) => a + b'
+    built = time_naive(f'{build} $ 0', repeat=1)
+    programs = [
+        ('map: For loop calling sq(l / i)', f'Elem m = For i = 0 To {n} Then sq(l / i) $ 0'),
+        ('map: Map(l, sq)', 'Elem m = Map(l, sq) $ 0'),
+        ('filter: For loop with If and Append',
+         f'Elem f = [] $ For i = 0 To {n} Then $ If big(l / i) Then Append(f, l / i) $ Ends $ 0'),
+        ('filter: Filter(l, big)', 'Elem f = Filter(l, big) $ 0'),
+        ('reduce: For loop calling add', f'Elem t = 0 $ For i = 0 To {n} Then $ Elem t = add(t, l / i) $ Ends $ 0'),
+        ('reduce: Reduce(l, add)', 'Reduce(l, add)'),
+    ]
+    for label, text in programs:
+        report(label, time_naive(f'{build} $ {text}', repeat=1) - built, n, 'elem')
+
+@benchmark
+def for_in(n=1_000_000):
+    print(f'for_in (n={n:,})')
+    build = f'Elem l = For i = 0 To {n} Then i $ Elem s = ShowRet(l)'
+    built = time_naive(f'{build} $ 0', repeat=1)
+    programs = [
+        ('list: For i = 0 To n with l / i', f'For i = 0 To {n} Then $ l / i $ Ends'),
+        ('list: For x In l', 'For x In l Then $ x $ Ends'),
+        ('list: total with l / i', f'Elem t = 0 $ For i = 0 To {n} Then $ Elem t = t + l / i $ Ends'),
+        ('list: total with For x In l', 'Elem t = 0 $ For x In l Then $ Elem t = t + x $ Ends'),
+    ]
+    for label, text in programs:
+        report(label, time_naive(f'{build} $ {text}', repeat=1) - built, n, 'elem')
+    length = len(', '.join(map(str, range(n))))
+    report('string characters: For c In s',
+           time_naive(f'{build} $ For c In s Then $ c $ Ends', repeat=1) - built, length, 'char')
+
+@benchmark
+def ranges(n=1_000_000):
+    print(f'ranges (n={n:,})')
+    for label, text in [
+        (f'list of {n:,} numbers from a For loop', f'Elem r = For i = 0 To {n} Then i'),
+        (f'Range(0, {n:,})', f'Elem r = Range(0, {n})'),
+        ('Range(0, 1,000,000,000,000)', 'Elem r = Range(0, 1000000000000)'),
+    ]:
+        tracemalloc.start()
+        result, error = naive.run('<benchmark>', text, {})
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        if error:
+            raise Exception(error.as_string())
+        del result
+        print(f'  {label + ": memory":<40} {size / 1_000_000:10.3f} MB')
+    report('For x In list', time_naive(f'Elem l = For i = 0 To {n} Then i $ For x In l Then $ x $ Ends', repeat=1), n)
+    report('For x In Range', time_naive(f'For x In Range(0, {n}) Then $ x $ Ends', repeat=1), n)
+
+@benchmark
+def generators(n=300_000):
+    print(f'generators (n={n:,}, three stages)')
+    stages = ('Define double(l) => Map(l, Define(x) => x * 2) $ '
+              'Define keep(l) => Filter(l, Define(x) => x > 10)')
+    streaming = ('Define source(n) => For i = 0 To n Then Yield i $ '
+                 'Define double(gen) => For x In gen Then Yield x * 2 $ '
+                 'Define keep(gen) => For x In gen Then If x > 10 Then Yield x')
+    for label, text in [
+        ('lists between stages', f'{stages} $ Elem t = 0 $ '
+            f'For x In keep(double(For i = 0 To {n} Then i)) Then $ Elem t = t + x $ Ends $ 0'),
+        ('generators between stages', f'{streaming} $ Elem t = 0 $ '
+            f'For x In keep(double(source({n}))) Then $ Elem t = t + x $ Ends $ 0'),
+    ]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        result, error = naive.run('<benchmark>', text, {})
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if error:
+            raise Exception(error.as_string())
+        report(label, elapsed, n, 'elem')
+        print(f'  {label + ": peak memory":<40} {peak / 1_000_000:10.1f} MB')
+
+@benchmark
+def string_views(size_mb=1):
+    n = size_mb * 1_000_000
+    text = 'abcdefghij' * (n // 10)
+    print(f'string_views ({size_mb} MB string)')
+    programs = [
+        ('scan: For i ... s / i', f'For i = 0 To {n} Then $ s / i $ Ends', n, 'char'),
+        ('scan: For c In s', 'For c In s Then $ c $ Ends', n, 'char'),
+        ('1,000 slices of 1 MB, kept in a list',
+         'Elem l = For i = 0 To 1000 Then s / [i, i + 1000000] $ 0', 1000, 'slice'),
+    ]
+    for label, text_program, count, unit in programs:
+        tracemalloc.start()
+        start = time.perf_counter()
+        result, error = naive.run('<benchmark>', text_program, {'s': text})
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if error:
+            raise Exception(error.as_string())
+        report(label, elapsed, count, unit)
+        print(f'  {label + ": peak memory":<40} {peak / 1_000_000:10.2f} MB')
+
+@benchmark
+def text_builtins(n=50_000):
+    print(f'text_builtins (n={n:,} words)')
+    text = ' '.join(f'word{i}' for i in range(n))
+    programs = [
+        ('split: scan characters in a For loop',
+         'Elem words = [] $ Elem word = "" $ For c In s Then $ '
+         'If c == " " Then $ Append(words, word) $ Elem word = "" $ Ends $ '
+         'If c != " " Then Elem word = word + c $ Ends $ 0'),
+        ('split: Split(s)', 'Elem words = Split(s) $ 0'),
+        ('join: Join(Split(s), ",")', 'Elem t = Join(Split(s), ",") $ 0'),
+        ('regex: Match per word in a loop', 'For w In Split(s) Then $ Match(w, "\\\\d+") $ Ends'),
+        ('regex: FindAll(s)', 'Elem l = FindAll(s, "\\\\d+") $ 0'),
+    ]
+    for label, program in programs:
+        report(label, time_naive(program, repeat=1, bindings={'s': text}), n, 'word')
+    info = naive.compile_pattern.cache_info()
+    print(f'  regex cache: {info.hits:,} hits, {info.misses:,} misses')
+
+@benchmark
+def file_io(size_mb=50):
+    line = 'x' * 79 + '\n'
+    n = size_mb * 1_000_000 // len(line)
+    print(f'file_io ({size_mb} MB, {n:,} lines)')
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'in.txt')
+        target = os.path.join(directory, 'out.txt')
+        with open(source, 'w') as file:
+            file.write(line * n)
+
+        def python_lines():
+            with open(source) as file:
+                for _ in file:
+                    pass
+
+        report('python: for line in file', time_python(python_lines, repeat=1), n, 'line')
+        for label, program in [
+            ('naive: Len(ReadFile(p))', f'Len(ReadFile("{source}"))'),
+            ('naive: For line In Lines(p)', f'For line In Lines("{source}") Then $ line $ Ends'),
+            ('naive: WriteFile(q, Lines(p))', f'WriteFile("{target}", Lines("{source}"))'),
+        ]:
+            report(label, time_naive(program, repeat=1, bindings={}), n, 'line')
+            tracemalloc.start()
+            time_naive(program, repeat=1, bindings={})
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f'  {label + ": peak memory":<40} {peak / 1_000_000:10.1f} MB')
+
+@benchmark
+def csv_rows(n=200_000):
+    print(f'csv_rows ({n:,} rows of 5 cells)')
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'in.csv')
+        target = os.path.join(directory, 'out.csv')
+        with open(source, 'w', newline='') as file:
+            csv.writer(file).writerows([i, i * 0.5, f'name {i}', 'a,b', i % 7] for i in range(n))
+
+        def python_rows():
+            with open(source, newline='') as file:
+                for _ in csv.reader(file):
+                    pass
+
+        report('python: for row in csv.reader', time_python(python_rows, repeat=1), n, 'row')
+        for label, program in [
+            ('naive: For row In CsvRows(p)', f'For row In CsvRows("{source}") Then $ row $ Ends'),
+            ('naive: For row In CsvRows(p, 1)', f'For row In CsvRows("{source}", 1) Then $ row $ Ends'),
+            ('naive: Sum(Map(CsvRows(p, 1), f))', f'Sum(Map(CsvRows("{source}", 1), Define(row) => row / 0))'),
+            ('naive: CsvWrite(q, CsvRows(p))', f'CsvWrite("{target}", CsvRows("{source}"))'),
+        ]:
+            report(label, time_naive(program, repeat=1, bindings={}), n, 'row')
+
+@benchmark
+def json_items(n=300_000):
+    print(f'json_items ({n:,} objects)')
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'in.json')
+        with open(source, 'w') as file:
+            json.dump([{'id': i, 'name': f'item {i}', 'tags': ['a', 'b'], 'price': i * 0.25} for i in range(n)], file)
+        print(f'  file size: {os.path.getsize(source) / 1_000_000:.1f} MB')
+
+        def python_load():
+            with open(source) as file:
+                json.load(file)
+
+        report('python: json.load', time_python(python_load, repeat=1), n, 'item')
+        for label, program in [
+            ('naive: JsonParse(ReadFile(p))', f'Len(JsonParse(ReadFile("{source}")))'),
+            ('naive: For item In JsonItems(p)', f'For item In JsonItems("{source}") Then $ item $ Ends'),
+        ]:
+            report(label, time_naive(program, repeat=1, bindings={}), n, 'item')
+            tracemalloc.start()
+            time_naive(program, repeat=1, bindings={})
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f'  {label + ": peak memory":<40} {peak / 1_000_000:10.1f} MB')
+
+@benchmark
+def binary_records(n=100_000):
+    layout = struct.Struct('<IHd')
+    print(f'binary_records ({n:,} records of {layout.size} bytes, "<IHd")')
+    data = bytearray(layout.size * n)
+    for i in range(n):
+        layout.pack_into(data, i * layout.size, i, i % 7, i * 0.5)
+    size = layout.size
+
+    def python_records():
+        total = 0
+        for record in layout.iter_unpack(data):
+            total += record[0]
+        return total
+
+    report('python: struct.iter_unpack', time_python(python_records, repeat=1), n, 'record')
+    for label, program in [
+        ('naive: id from 4 bytes, byte by byte',
+         f'Elem t = 0 $ For i = 0 To {n} Then $ Elem o = i * {size} $ '
+         'Elem t = t + b / o + b / (o + 1) * 256 + b / (o + 2) * 65536 + b / (o + 3) * 16777216 $ Ends $ t'),
+        ('naive: ReadInt per record', f'Elem t = 0 $ For i = 0 To {n} Then Elem t = t + ReadUInt(b, i * {size}) $ t'),
+        ('naive: Unpack per record', f'Elem t = 0 $ For i = 0 To {n} Then Elem t = t + Unpack(b, "<IHd", i * {size}) / 0 $ t'),
+        ('naive: For r In UnpackAll(b, f)', 'Elem t = 0 $ For r In UnpackAll(b, "<IHd") Then Elem t = t + r / 0 $ t'),
+    ]:
+        report(label, time_naive(program, repeat=1, bindings={'b': data}), n, 'record')
+
+@benchmark
+def profiler(n=20):
+    print(f'profiler (fib({n}) and a 200,000 step loop)')
+    for label, program in [
+        ('fib', f'Define fib(n) => If n < 2 Then n Elif 1 Then fib(n - 1) + fib(n - 2) $ fib({n})'),
+        ('loop', 'Elem t = 0 $ For i = 0 To 200000 Then Elem t = t + i * 2 $ t'),
+    ]:
+        plain = time_naive(program, repeat=5)
+        report(f'{label}: no profiler', plain)
+        for profiler_type in (naive.ProfilingInterpreter, naive.SamplingProfiler):
+            profiled = time_naive(program, repeat=5, profiler_type=profiler_type)
+            report(f'{label}: {profiler_type.__name__}', profiled)
+            print(f'  {label + ": overhead":<40} {profiled / plain - 1:10.1%}')
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -1,7 +1,25 @@
+import array
+import bisect
+import csv
+import functools
+import json
+import inspect
 import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
 from string_with_arrows import string_with_arrows
 import string
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 #Helper constants
 DIGITS = "0123456789"
 LETTERS = string.ascii_letters
@@ -31,6 +49,7 @@ T_LSQUARE = 'LSQUARE'
 T_RSQUARE = 'RSQUARE'
 T_LCURLY = 'LCURLY'
 T_RCURLY = 'RCURLY'
+T_COLON = 'COLON'
 
 #Logical
 T_EE = 'EE'
@@ -47,6 +66,9 @@ T_NOT = 'Not'
 T_COMMA = 'COMMA'
 T_ARROW = 'ARROW'
 
+#For Records
+T_DOT = 'DOT'
+
 #Essentials
 T_EOF = 'EOF'
 T_IDENTIFIER = 'IDENTIFIER'
@@ -71,7 +93,10 @@ KEYWORDS = [
     'While',
     'Step',
     'To',
+    'In',
     'Define',
+    'Record',
+    'Yield',
     'Ends'
 ]
 
@@ -219,6 +244,15 @@ class Lexer:
             elif self.current_char == ']':
                 tokens.append(Token(T_RSQUARE, start_pos=self.pos))
                 self.advance()
+            elif self.current_char == '{':
+                tokens.append(Token(T_LCURLY, start_pos=self.pos))
+                self.advance()
+            elif self.current_char == '}':
+                tokens.append(Token(T_RCURLY, start_pos=self.pos))
+                self.advance()
+            elif self.current_char == ':':
+                tokens.append(Token(T_COLON, start_pos=self.pos))
+                self.advance()
             elif self.current_char == '!':
                 token, error = self.make_not_equals()
                 if error: return [], error
@@ -233,6 +267,9 @@ class Lexer:
             elif self.current_char == ',':
                 tokens.append(Token(T_COMMA, start_pos=self.pos))
                 self.advance()
+            elif self.current_char == '.':
+                tokens.append(Token(T_DOT, start_pos=self.pos))
+                self.advance()
             
             else:
                 start_pos = self.pos.copy()
@@ -273,14 +310,13 @@ class Lexer:
         }
         while self.current_char != None and (self.current_char != '"' or escape_character):
             if escape_character:
-                string += self.escape_chars.get(self.current_char, self.current_char)
+                string += escape_characters.get(self.current_char, self.current_char)
+                escape_character = False
+            elif self.current_char == '\\':
+                escape_character = True
             else:
-                if self.current_char == '\\':
-                    escape_character = True
-                else:
-                    string += self.current_char
+                string += self.current_char
             self.advance()
-            escape_character = False
 
         
         self.advance()
@@ -380,6 +416,15 @@ class ListNode:
         self.start_pos = start_pos
         self.end_pos = end_pos
 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Map Node
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class MapNode:
+    def __init__(self, pair_nodes, start_pos, end_pos):
+        self.pair_nodes = pair_nodes
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #ElementAccessNode
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -415,6 +460,29 @@ class BinaryOperationNode:
         self.start_pos = self.left_node.start_pos
         self.end_pos = self.right_node.end_pos
 
+        # Operation key (token type, or 'And'/'Or' for keywords) and the
+        # inline cache filled by the Interpreter: one monomorphic entry, a
+        # few polymorphic ones, then megamorphic (no caching at all).
+        self.op = op_token.value if op_token.type == T_KEYWORD else op_token.type
+        # And/Or only evaluate their right operand when the left one does not
+        # already decide the result (see Interpreter.short_circuit_logic).
+        self.short_circuits = self.op in (T_AND, T_OR)
+        self.cache_left_type = None
+        self.cache_right_type = None
+        self.cache_operation = None
+        self.cache_entries = {}
+        self.cache_megamorphic = False
+        self.cache_misses = 0
+
+    def cache_state(self):
+        if self.cache_megamorphic:
+            return 'megamorphic'
+        if self.cache_entries:
+            return 'polymorphic'
+        if self.cache_operation:
+            return 'monomorphic'
+        return 'uninitialized'
+
 
     def __repr__(self):
         return f'({self.left_node}, {self.op_token}, {self.right_node})'
@@ -454,6 +522,23 @@ class ForNode:
         self.step_value_node = step_value_node
         self.body_node = body_node
         self.should_return_null = should_return_null
+        self.value_unused = False
+        self.rebinds_elem = None
+
+        self.start_pos = self.elem_name_token.start_pos
+        self.end_pos = self.body_node.end_pos
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#ForIn Node
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class ForInNode:
+    def __init__(self, var_name_token, iterable_node, body_node, should_return_null):
+        self.elem_name_token = var_name_token
+        self.iterable_node = iterable_node
+        self.body_node = body_node
+        self.should_return_null = should_return_null
+        self.value_unused = False
+        self.rebinds_elem = None
 
         self.start_pos = self.elem_name_token.start_pos
         self.end_pos = self.body_node.end_pos
@@ -466,6 +551,7 @@ class WhileNode:
         self.condition_node = condition_node
         self.body_node = body_node
         self.should_return_null = should_return_null
+        self.value_unused = False
 
         self.start_pos = self.condition_node.start_pos
         self.end_pos = self.body_node.end_pos
@@ -479,6 +565,11 @@ class FunctionDefinitionNode:
         self.func_params = func_params
         self.func_body_node = func_body_node
         self.should_return_null = should_return_null
+        self.is_generator = mark_yields(func_body_node)
+        # Recycled call frames shared by every Function made from this
+        # definition. None when frames must not be reused, see Function:
+        # a generator's frame lives on while the generator is suspended.
+        self.frame_pool = [] if not defines_function(func_body_node) and not self.is_generator else None
 
         if self.func_name_token:
             self.start_pos = self.func_name_token.start_pos
@@ -490,6 +581,41 @@ class FunctionDefinitionNode:
         self.end_pos = self.func_body_node.end_pos
 
 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#RecordDefinition Node
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class RecordDefinitionNode:
+    def __init__(self, record_name_token, field_tokens, end_pos):
+        self.record_name_token = record_name_token
+        self.field_tokens = field_tokens
+        # Each field gets a fixed slot in the record's value tuple.
+        self.offsets = {token.value: offset for offset, token in enumerate(field_tokens)}
+        self.start_pos = record_name_token.start_pos
+        self.end_pos = end_pos
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#FieldAccess Node
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class FieldAccessNode:
+    def __init__(self, record_node, field_name_token):
+        self.record_node = record_node
+        self.field_name_token = field_name_token
+        self.start_pos = record_node.start_pos
+        self.end_pos = field_name_token.end_pos
+        # Offsets of the record type last read here and the field's slot.
+        self.cache_offsets = None
+        self.cache_offset = None
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Yield Node
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class YieldNode:
+    def __init__(self, yield_token, value_node):
+        self.yield_token = yield_token
+        self.value_node = value_node
+        self.start_pos = yield_token.start_pos
+        self.end_pos = value_node.end_pos
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #Call Node
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -497,6 +623,9 @@ class CallNode:
     def __init__(self, node_to_call, func_params):
         self.node_to_call = node_to_call
         self.func_params = func_params
+        # Body of the last Function called here with the right arity, so
+        # the argument count is only checked again when the callee changes.
+        self.checked_body_node = None
 
         self.start_pos = self.node_to_call.start_pos
 
@@ -506,6 +635,61 @@ class CallNode:
             self.end_pos = self.node_to_call.end_pos
 
 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Node Helpers
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def child_nodes(node):
+    # Yields the direct sub-nodes of a node, looking through the lists and
+    # tuples (If cases, call arguments, statements) that hold them.
+    pending = list(vars(node).values())
+    while pending:
+        item = pending.pop()
+        if isinstance(item, (list, tuple)):
+            pending.extend(item)
+        elif type(item).__name__.endswith('Node'):
+            yield item
+
+def defines_function(node):
+    # True if a Define appears anywhere inside node.
+    if isinstance(node, FunctionDefinitionNode):
+        return True
+    return any(defines_function(child) for child in child_nodes(node))
+
+def mark_yields(node):
+    # Sets contains_yield on node and every node under it, without looking
+    # into nested Defines, and returns whether node contains a Yield.
+    found = isinstance(node, YieldNode)
+    for child in child_nodes(node):
+        if isinstance(child, FunctionDefinitionNode):
+            child.contains_yield = False
+        elif mark_yields(child):
+            found = True
+    node.contains_yield = found
+    return found
+
+def misplaced_yield(node):
+    # The first node holding a Yield that a generator cannot suspend in.
+    if not node.contains_yield:
+        return None
+    if not isinstance(node, GENERATOR_NODES):
+        return node
+    for child in child_nodes(node):
+        misplaced = misplaced_yield(child)
+        if misplaced:
+            return misplaced
+    return None
+
+def assigns_name(node, name):
+    # True if evaluating node may rebind name in the current symbol table.
+    # Function bodies run in their own table, so they are not searched.
+    if isinstance(node, ElemAssignNode) and node.elem_name_token.value == name:
+        return True
+    if isinstance(node, (ForNode, ForInNode)) and node.elem_name_token.value == name:
+        return True
+    if isinstance(node, FunctionDefinitionNode):
+        return node.func_name_token is not None and node.func_name_token.value == name
+    return any(assigns_name(child, name) for child in child_nodes(node))
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #Parse Result
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -657,7 +841,58 @@ class Parser:
             )
         )
 
-    
+    def map_expression(self):
+        res = ParseResult()
+        pair_nodes = []
+        start_pos = self.current_token.start_pos.copy()
+
+        if self.current_token.type != T_LCURLY:
+            return res.failure(InvalidSyntaxError(
+                self.current_token.start_pos, self.current_token.end_pos,
+                "Expected '{'"
+            ))
+        res.register_advancement()
+        self.advance()
+        if self.current_token.type == T_RCURLY:
+            res.register_advancement()
+            self.advance()
+        else:
+            while True:
+                key_node = res.register(self.expression())
+                if res.error: return res
+
+                if self.current_token.type != T_COLON:
+                    return res.failure(InvalidSyntaxError(
+                        self.current_token.start_pos, self.current_token.end_pos,
+                        "Expected ':'"
+                    ))
+                res.register_advancement()
+                self.advance()
+
+                value_node = res.register(self.expression())
+                if res.error: return res
+                pair_nodes.append((key_node, value_node))
+
+                if self.current_token.type != T_COMMA:
+                    break
+                res.register_advancement()
+                self.advance()
+
+            if self.current_token.type != T_RCURLY:
+                return res.failure(InvalidSyntaxError(
+                    self.current_token.start_pos, self.current_token.end_pos,
+                    "Expected ',' or '}'"
+                ))
+            res.register_advancement()
+            self.advance()
+        return res.success(
+            MapNode(
+                pair_nodes,
+                start_pos,
+                self.current_token.end_pos.copy()
+            )
+        )
+
     def if_expression(self):
         res = ParseResult()
         all_cases  = res.register(self.if_expression_cases('If'))
@@ -682,6 +917,7 @@ class Parser:
 
                 statements = res.register(self.statements())
                 if res.error: return res
+                self.discard_statement_values(statements)
                 else_case = (statements, True)
 
                 if self.current_token.matches(T_KEYWORD, 'Ends'):
@@ -744,6 +980,7 @@ class Parser:
 
             statements = res.register(self.statements())
             if res.error: return res
+            self.discard_statement_values(statements)
             cases.append((condition, statements, True))
 
             if self.current_token.matches(T_KEYWORD, 'Ends'):
@@ -787,38 +1024,53 @@ class Parser:
         res.register_advancement()
         self.advance()
 
-        if self.current_token.type != T_EQ:
-            return res.failure(InvalidSyntaxError(
-                self.current_token.start_pos, self.current_token.end_pos,
-                f"Expected '='"
-            ))
-        res.register_advancement()
-        self.advance()
+        if self.current_token.matches(T_KEYWORD, 'In'):
+            res.register_advancement()
+            self.advance()
 
-        start_value = res.register(self.expression())
-        if res.error: return res
+            iterable = res.register(self.expression())
+            if res.error: return res
 
-        if not self.current_token.matches(T_KEYWORD, 'To'):
-            return res.failure(InvalidSyntaxError(
-                self.current_token.start_pos, self.current_token.end_pos,
-                f"Expected 'To'"
-            ))
-        
-        res.register_advancement()
-        self.advance()
+            make_node = lambda body, should_return_null: ForInNode(
+                elem_name, iterable, body, should_return_null
+            )
+        else:
+            if self.current_token.type != T_EQ:
+                return res.failure(InvalidSyntaxError(
+                    self.current_token.start_pos, self.current_token.end_pos,
+                    f"Expected '=' or 'In'"
+                ))
+            res.register_advancement()
+            self.advance()
 
-        end_value = res.register(self.expression())
-        if res.error: return res
+            start_value = res.register(self.expression())
+            if res.error: return res
 
-        if self.current_token.matches(T_KEYWORD, 'Step'):
+            if not self.current_token.matches(T_KEYWORD, 'To'):
+                return res.failure(InvalidSyntaxError(
+                    self.current_token.start_pos, self.current_token.end_pos,
+                    f"Expected 'To'"
+                ))
+        
             res.register_advancement()
             self.advance()
 
-            step_value = res.register(self.expression())
+            end_value = res.register(self.expression())
             if res.error: return res
-        else:
-            step_value = None
-        
+
+            if self.current_token.matches(T_KEYWORD, 'Step'):
+                res.register_advancement()
+                self.advance()
+
+                step_value = res.register(self.expression())
+                if res.error: return res
+            else:
+                step_value = None
+
+            make_node = lambda body, should_return_null: ForNode(
+                elem_name, start_value, end_value, step_value, body, should_return_null
+            )
+
         if not self.current_token.matches(T_KEYWORD, 'Then'):
             return res.failure(InvalidSyntaxError(
                 self.current_token.start_pos, self.current_token.end_pos,
@@ -834,6 +1086,7 @@ class Parser:
 
             body = res.register(self.statements())
             if res.error: return res
+            self.discard_statement_values(body)
 
             if not self.current_token.matches(T_KEYWORD, 'Ends'):
                 return res.failure(InvalidSyntaxError(
@@ -844,29 +1097,11 @@ class Parser:
             res.register_advancement()
             self.advance()
 
-            return res.success(
-                ForNode(
-                    elem_name, 
-                    start_value, 
-                    end_value, 
-                    step_value, 
-                    body, 
-                    True
-                )
-            )
+            return res.success(make_node(body, True))
         body_expression = res.register(self.expression())
         if res.error: return res
 
-        return res.success(
-            ForNode(
-                elem_name, 
-                start_value, 
-                end_value, 
-                step_value, 
-                body_expression, 
-                False
-            )
-        )
+        return res.success(make_node(body_expression, False))
 
     def while_expression(self):
         res = ParseResult()
@@ -897,6 +1132,7 @@ class Parser:
             self.advance()
             body = res.register(self.statements())
             if res.error: return res
+            self.discard_statement_values(body)
 
             if not self.current_token.matches(T_KEYWORD, 'Ends'):
                 return res.failure(InvalidSyntaxError(
@@ -954,7 +1190,19 @@ class Parser:
                 res.register_advancement()
                 self.advance()
             
-            return res.success(CallNode(molecule, arg_node))
+            molecule = CallNode(molecule, arg_node)
+
+        while self.current_token.type == T_DOT:
+            res.register_advancement()
+            self.advance()
+            if self.current_token.type != T_IDENTIFIER:
+                return res.failure(InvalidSyntaxError(
+                    self.current_token.start_pos, self.current_token.end_pos,
+                    "Expected IDENTIFIER"
+                ))
+            molecule = FieldAccessNode(molecule, self.current_token)
+            res.register_advancement()
+            self.advance()
         
         return res.success(molecule)
 
@@ -996,6 +1244,11 @@ class Parser:
             list_expr = res.register(self.list_expression())
             if res.error: return res
             return res.success(list_expr)
+
+        elif token.type == T_LCURLY:
+            map_expr = res.register(self.map_expression())
+            if res.error: return res
+            return res.success(map_expr)
         
         elif token.matches(T_KEYWORD, 'If'):
             if_expr = res.register(self.if_expression())
@@ -1016,10 +1269,15 @@ class Parser:
             func_def = res.register(self.func_def())
             if res.error: return res
             return res.success(func_def)
+
+        elif token.matches(T_KEYWORD, 'Record'):
+            record_def = res.register(self.record_def())
+            if res.error: return res
+            return res.success(record_def)
             
         return res.failure(InvalidSyntaxError(
             token.start_pos, token.end_pos,
-            "Expected int, float, identifier, '+', '-', '(','[', If, For, While, Define"
+            "Expected int, float, identifier, '+', '-', '(', '[', '{', If, For, While, Define, Record"
         ))
     
     def power(self):
@@ -1090,6 +1348,15 @@ class Parser:
             expression = res.register(self.expression())
             if res.error: return res
             return res.success(ElemAssignNode(elem_name, expression))
+
+        if self.current_token.matches(T_KEYWORD, 'Yield'):
+            yield_token = self.current_token
+            res.register_advancement()
+            self.advance()
+
+            expression = res.register(self.expression())
+            if res.error: return res
+            return res.success(YieldNode(yield_token, expression))
             
         node = res.register(self.BinaryOperation(self.logical_expression, ((T_KEYWORD, "And"),(T_KEYWORD, "Or"))))
         if res.error:
@@ -1170,7 +1437,7 @@ class Parser:
             if res.error:
                 return res
             
-            return res.success(FunctionDefinitionNode(
+            return self.checked_func_def(res, FunctionDefinitionNode(
                 var_name_token, 
                 fun_params,
                 node_to_return,
@@ -1198,7 +1465,7 @@ class Parser:
         res.register_advancement()
         self.advance()
 
-        return res.success(
+        return self.checked_func_def(res,
             FunctionDefinitionNode(
                 var_name_token,
                 fun_params,
@@ -1207,10 +1474,80 @@ class Parser:
                 )
         )
 
+    def checked_func_def(self, res, func_def):
+        # A Yield must sit where the GeneratorInterpreter can suspend.
+        misplaced = misplaced_yield(func_def.func_body_node) if func_def.is_generator else None
+        if misplaced:
+            return res.failure(InvalidSyntaxError(
+                misplaced.start_pos, misplaced.end_pos,
+                "Yield can only be used in statements, If, For and While"
+            ))
+        return res.success(func_def)
+
 
 
 
-        
+    def record_def(self):
+        res = ParseResult()
+
+        if not self.current_token.matches(T_KEYWORD, 'Record'):
+            return res.failure(InvalidSyntaxError(
+                self.current_token.start_pos, self.current_token.end_pos,
+                "Expected 'Record'"
+            ))
+        res.register_advancement()
+        self.advance()
+
+        if self.current_token.type != T_IDENTIFIER:
+            return res.failure(InvalidSyntaxError(
+                self.current_token.start_pos, self.current_token.end_pos,
+                "Expected IDENTIFIER"
+            ))
+        record_name_token = self.current_token
+        res.register_advancement()
+        self.advance()
+
+        if self.current_token.type != T_LPAREN:
+            return res.failure(InvalidSyntaxError(
+                self.current_token.start_pos, self.current_token.end_pos,
+                "Expected '('"
+            ))
+        res.register_advancement()
+        self.advance()
+
+        field_tokens = []
+        while self.current_token.type == T_IDENTIFIER:
+            if any(token.value == self.current_token.value for token in field_tokens):
+                return res.failure(InvalidSyntaxError(
+                    self.current_token.start_pos, self.current_token.end_pos,
+                    f"Duplicate field '{self.current_token.value}'"
+                ))
+            field_tokens.append(self.current_token)
+            res.register_advancement()
+            self.advance()
+            if self.current_token.type != T_COMMA:
+                break
+            res.register_advancement()
+            self.advance()
+
+        if self.current_token.type != T_RPAREN:
+            return res.failure(InvalidSyntaxError(
+                self.current_token.start_pos, self.current_token.end_pos,
+                "Expected IDENTIFIER, ',' or ')'"
+            ))
+        end_pos = self.current_token.end_pos
+        res.register_advancement()
+        self.advance()
+
+        return res.success(RecordDefinitionNode(record_name_token, field_tokens, end_pos))
+
+    def discard_statement_values(self, statements):
+        # Block bodies of If, For and While evaluate to null, so loops used
+        # as statements inside them never need to collect their results.
+        for statement in statements.element_nodes:
+            if isinstance(statement, (ForNode, ForInNode, WhileNode)):
+                statement.value_unused = True
+
     def BinaryOperation(self, function_a, operations, function_b=None):
         if not function_b: function_b = function_a
         res = ParseResult()
@@ -1249,6 +1586,8 @@ class RTResult:
 #Value Class
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class Value:
+    __slots__ = ('start_pos', 'end_pos', 'context')
+
     def __init__(self):
         self.set_pos()
         self.set_context()
@@ -1296,6 +1635,9 @@ class Value:
         return self.illegal_operation()
     def is_true(self):
         return False
+    def iterate(self):
+        # A Python iterator over the values For ... In visits, or None.
+        return None
     
     def illegal_operation(self, other = None):
         if not other: other = self
@@ -1411,6 +1753,9 @@ class Number:
     
     def is_true(self):
         return self.value != 0
+
+    def iterate(self):
+        return None
     
     def __repr__(self):
         return str(self.value)
@@ -1419,26 +1764,269 @@ Number.null = Number(0)
 Number.false = Number(0)
 Number.true = Number(1)
 Number.PI = Number(math.pi)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Binary Operations
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+BINARY_OPERATIONS = {
+    T_PLUS: 'added_to',
+    T_MINUS: 'subtracted_by',
+    T_MUL: 'multiplied_by',
+    T_DIV: 'divided_by',
+    T_POW: 'powered_by',
+    T_EE: 'get_comparison_eq',
+    T_NE: 'get_comparison_ne',
+    T_LT: 'get_comparison_lt',
+    T_GT: 'get_comparison_gt',
+    T_LTE: 'get_comparison_lte',
+    T_GTE: 'get_comparison_gte',
+    T_AND: 'anded_by',
+    T_OR: 'ored_by',
+}
+
+def number_divided_by(left, right):
+    if right.value == 0:
+        return None, RunTimeError(
+            right.start_pos, right.end_pos, 'Division by Zero', left.context
+        )
+    return Number(left.value / right.value).set_context(left.context), None
+
+# Number (op) Number implementations used by the inline caches. They skip
+# the isinstance checks the Number methods have to make.
+NUMBER_OPERATIONS = {
+    T_PLUS: lambda left, right: (Number(left.value + right.value).set_context(left.context), None),
+    T_MINUS: lambda left, right: (Number(left.value - right.value).set_context(left.context), None),
+    T_MUL: lambda left, right: (Number(left.value * right.value).set_context(left.context), None),
+    T_DIV: number_divided_by,
+    T_POW: lambda left, right: (Number(left.value ** right.value).set_context(left.context), None),
+    T_EE: lambda left, right: (Number(int(left.value == right.value)).set_context(left.context), None),
+    T_NE: lambda left, right: (Number(int(left.value != right.value)).set_context(left.context), None),
+    T_LT: lambda left, right: (Number(int(left.value < right.value)).set_context(left.context), None),
+    T_GT: lambda left, right: (Number(int(left.value > right.value)).set_context(left.context), None),
+    T_LTE: lambda left, right: (Number(int(left.value <= right.value)).set_context(left.context), None),
+    T_GTE: lambda left, right: (Number(int(left.value >= right.value)).set_context(left.context), None),
+    T_AND: lambda left, right: (Number(int(left.value and right.value)).set_context(left.context), None),
+    T_OR: lambda left, right: (Number(int(left.value or right.value)).set_context(left.context), None),
+}
+
+def resolve_binary_operation(op, left_type, right_type):
+    # Returns a function (left, right) -> (result, error) for these types.
+    if left_type is Number and right_type is Number:
+        return NUMBER_OPERATIONS[op]
+    if left_type is Number and right_type is Array:
+        return lambda left, right: right.elementwise(op, left, reflected=True)
+    return getattr(left_type, BINARY_OPERATIONS[op])
+
+BINARY_CACHE_SIZE = 4
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Persistent Vector
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+VECTOR_BITS = 5
+VECTOR_WIDTH = 1 << VECTOR_BITS
+VECTOR_MASK = VECTOR_WIDTH - 1
+
+class PersistentVector:
+    # Immutable vector stored as a bit-partitioned trie of 32-wide nodes plus
+    # a tail buffer holding the last (up to 32) elements. Every update returns
+    # a new vector that shares all untouched nodes with the old one, so
+    # append, set and pop cost O(log32 n) and never alias the original.
+    __slots__ = ('count', 'shift', 'root', 'tail')
+
+    def __init__(self, count, shift, root, tail):
+        self.count = count
+        self.shift = shift
+        self.root = root
+        self.tail = tail
+
+    @staticmethod
+    def from_list(items):
+        items = list(items)
+        count = len(items)
+        if count == 0:
+            return PersistentVector.EMPTY
+        tail_offset = ((count - 1) >> VECTOR_BITS) << VECTOR_BITS
+        nodes = [items[i:i + VECTOR_WIDTH] for i in range(0, tail_offset, VECTOR_WIDTH)]
+        shift = VECTOR_BITS
+        while len(nodes) > VECTOR_WIDTH:
+            nodes = [nodes[i:i + VECTOR_WIDTH] for i in range(0, len(nodes), VECTOR_WIDTH)]
+            shift += VECTOR_BITS
+        return PersistentVector(count, shift, nodes, items[tail_offset:])
+
+    def tail_offset(self):
+        if self.count < VECTOR_WIDTH:
+            return 0
+        return ((self.count - 1) >> VECTOR_BITS) << VECTOR_BITS
+
+    def leaf_for(self, index):
+        if index >= self.tail_offset():
+            return self.tail
+        node = self.root
+        level = self.shift
+        while level > 0:
+            node = node[(index >> level) & VECTOR_MASK]
+            level -= VECTOR_BITS
+        return node
+
+    def check_index(self, index):
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError('vector index out of range')
+        return index
+
+    def append(self, value):
+        if len(self.tail) < VECTOR_WIDTH:
+            return PersistentVector(self.count + 1, self.shift, self.root, self.tail + [value])
+        return self.push_tail([value], 1)
+
+    def extend(self, values):
+        vector = self
+        values = list(values)
+        i = 0
+        while i < len(values):
+            room = VECTOR_WIDTH - len(vector.tail)
+            if room > 0:
+                chunk = values[i:i + room]
+                vector = PersistentVector(vector.count + len(chunk), vector.shift, vector.root, vector.tail + chunk)
+            else:
+                chunk = values[i:i + VECTOR_WIDTH]
+                vector = vector.push_tail(chunk, len(chunk))
+            i += len(chunk)
+        return vector
+
+    def push_tail(self, new_tail, added):
+        # Moves the full tail into the trie and starts a new tail.
+        shift = self.shift
+        if (self.count >> VECTOR_BITS) > (1 << shift):
+            root = [self.root, self.new_path(shift, self.tail)]
+            shift += VECTOR_BITS
+        else:
+            root = self.push_tail_into(shift, self.root, self.tail)
+        return PersistentVector(self.count + added, shift, root, new_tail)
+
+    def push_tail_into(self, level, parent, tail_node):
+        sub_index = ((self.count - 1) >> level) & VECTOR_MASK
+        node = parent[:]
+        if level == VECTOR_BITS:
+            child = tail_node
+        elif sub_index < len(parent):
+            child = self.push_tail_into(level - VECTOR_BITS, parent[sub_index], tail_node)
+        else:
+            child = self.new_path(level - VECTOR_BITS, tail_node)
+        if sub_index < len(node):
+            node[sub_index] = child
+        else:
+            node.append(child)
+        return node
+
+    @staticmethod
+    def new_path(level, node):
+        while level > 0:
+            node = [node]
+            level -= VECTOR_BITS
+        return node
+
+    def set(self, index, value):
+        index = self.check_index(index)
+        if index >= self.tail_offset():
+            tail = self.tail[:]
+            tail[index & VECTOR_MASK] = value
+            return PersistentVector(self.count, self.shift, self.root, tail)
+        return PersistentVector(self.count, self.shift, self.assoc(self.shift, self.root, index, value), self.tail)
+
+    def assoc(self, level, node, index, value):
+        node = node[:]
+        if level == 0:
+            node[index & VECTOR_MASK] = value
+        else:
+            sub_index = (index >> level) & VECTOR_MASK
+            node[sub_index] = self.assoc(level - VECTOR_BITS, node[sub_index], index, value)
+        return node
+
+    def pop(self, index=-1):
+        index = self.check_index(index)
+        if index != self.count - 1:
+            items = self.to_list()
+            del items[index]
+            return PersistentVector.from_list(items)
+        if self.count == 1:
+            return PersistentVector.EMPTY
+        if len(self.tail) > 1:
+            return PersistentVector(self.count - 1, self.shift, self.root, self.tail[:-1])
+        new_tail = self.leaf_for(self.count - 2)
+        root = self.pop_tail_from(self.shift, self.root) or []
+        shift = self.shift
+        if shift > VECTOR_BITS and len(root) == 1:
+            root = root[0]
+            shift -= VECTOR_BITS
+        return PersistentVector(self.count - 1, shift, root, new_tail)
+
+    def pop_tail_from(self, level, node):
+        sub_index = ((self.count - 2) >> level) & VECTOR_MASK
+        if level > VECTOR_BITS:
+            child = self.pop_tail_from(level - VECTOR_BITS, node[sub_index])
+            if child is None and sub_index == 0:
+                return None
+            return node[:sub_index] + ([child] if child is not None else [])
+        if sub_index == 0:
+            return None
+        return node[:sub_index]
+
+    def leaves(self):
+        stack = [(self.root, self.shift)] if self.root else []
+        while stack:
+            node, level = stack.pop()
+            if level == VECTOR_BITS:
+                yield from node
+            else:
+                stack.extend((child, level - VECTOR_BITS) for child in reversed(node))
+        yield self.tail
+
+    def to_list(self):
+        items = []
+        for leaf in self.leaves():
+            items.extend(leaf)
+        return items
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PersistentVector.from_list(self.to_list()[index])
+        index = self.check_index(index)
+        return self.leaf_for(index)[index & VECTOR_MASK]
+
+    def __iter__(self):
+        for leaf in self.leaves():
+            yield from leaf
+
+PersistentVector.EMPTY = PersistentVector(0, VECTOR_BITS, [], [])
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #List Value Class
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class List(Value):
+    # Lists are backed by a PersistentVector. Operators build new vectors;
+    # only the Append, Pop and Extend built-ins replace the vector in place.
     def __init__(self, elements):
         super().__init__()
-        self.elements = elements
+        if not isinstance(elements, PersistentVector):
+            elements = PersistentVector.from_list(elements)
+        self.vector = elements
+
+    @property
+    def elements(self):
+        return self.vector
 
     def added_to(self, other):
-        new_list = self.copy()
-        new_list.elements.append(other)
-        return new_list, None
+        return List(self.vector.append(other)).set_context(self.context), None
     
     def subtracted_by(self, other):
         if isinstance(other, Number):
-            new_list = self.copy()
             try:
-                new_list.elements.pop(other.value)
-                return new_list, None
-            except IndexError:
+                return List(self.vector.pop(other.value)).set_context(self.context), None
+            except (IndexError, TypeError):
                 return None, RunTimeError(
                     other.start_pos, other.end_pos, 
                     "Element at index {} does not exist!".format(other),
@@ -1449,16 +2037,14 @@ class List(Value):
     
     def multiplied_by(self, other):
         if isinstance(other, List):
-            new_list = self.copy()
-            new_list.elements.extend(other.elements)
-            return new_list, None
+            return List(self.vector.extend(other.vector)).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def divided_by(self, other):
         if isinstance(other, Number):
             try:
-                return self.elements[other.value], None
+                return self.vector[other.value], None
             except:
                 return None, RunTimeError(
                     other.start_pos, other.end_pos,
@@ -1468,29 +2054,152 @@ class List(Value):
         else:
             return None, Value.illegal_operation(self, other)
         
+    def iterate(self):
+        return iter(self.vector)
+
     def copy(self):
-        copy = List(self.elements)
+        copy = List(self.vector)
         copy.set_context(self.context)
         copy.set_pos(self.start_pos, self.end_pos)
         return copy
     
     def __repr__(self) :
-        return f'[{", ".join([str(x) for x in self.elements])}]'
+        return f'[{", ".join([str(x) for x in self.vector])}]'
     
     def __str__(self) :
-        return ", ".join([str(x) for x in self.elements])
-            
+        return ", ".join([str(x) for x in self.vector])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#LazyList Value Class
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class LazyList(List):
+    # List over a Python list of raw elements: the results of a For or While
+    # loop, or a list handed in from Python. Raw elements are converted with
+    # from_python and only when they are read; reading one number or string
+    # element does not convert the rest.
+    def __init__(self, raw_elements):
+        Value.__init__(self)
+        self.raw_elements = raw_elements
+        self._vector = None
+        self.from_python = False
+
+    @property
+    def vector(self):
+        if self._vector is None:
+            self._vector = PersistentVector.from_list([
+                from_python(x).set_context(self.context) for x in self.raw_elements
+            ])
+            self.raw_elements = None
+        return self._vector
+
+    @vector.setter
+    def vector(self, vector):
+        self._vector = vector
+        self.raw_elements = None
+
+    def divided_by(self, other):
+        if self.raw_elements is not None and isinstance(other, Number):
+            try:
+                element = self.raw_elements[other.value]
+            except (IndexError, TypeError):
+                element = None
+            if isinstance(element, (int, float, str)):
+                return from_python(element).set_context(self.context), None
+        return super().divided_by(other)
+
+    def iterate(self):
+        if self.raw_elements is None:
+            return super().iterate()
+        return map(from_python, self.raw_elements)
+
+    def copy(self):
+        if self.raw_elements is None:
+            return super().copy()
+        copy = LazyList(self.raw_elements)
+        copy.from_python = self.from_python
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #String Value Class
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class String(Value):
+    # Concatenation does not join eagerly. A String built with + keeps a
+    # pieces list and how many of its leading pieces belong to it. Adding to
+    # the most recent String built on a pieces list appends to that list in
+    # place, so a chain of s = s + x is linear. The pieces are joined the
+    # first time the value is printed, compared or otherwise read.
+    #
+    # Slicing does not copy either: s / [start, end] is a view, a String
+    # with a buffer (the text it was cut from), a start and a length. Views
+    # of views share the first buffer. A view is only copied out of its
+    # buffer when its value is needed, e.g. to concatenate or print it.
     def __init__(self, value):
         super().__init__()
         self.value = value
 
+    @property
+    def value(self):
+        if self._value is None:
+            if self.pieces is not None:
+                self._value = ''.join(self.pieces[:self.piece_count])
+            else:
+                self._value = self.buffer[self.start:self.start + self.length]
+                self.buffer = None
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self.pieces = None
+        self.piece_count = 0
+        self.buffer = None
+        self.start = 0
+        self.length = len(value)
+
+    @staticmethod
+    def from_pieces(pieces, piece_count, length):
+        string = String('')
+        string._value = None
+        string.pieces = pieces
+        string.piece_count = piece_count
+        string.length = length
+        return string
+
+    @staticmethod
+    def view(buffer, start, length):
+        string = String('')
+        string._value = None
+        string.buffer = buffer
+        string.start = start
+        string.length = length
+        return string
+
+    def text(self):
+        # The text this string reads from and where in it it starts,
+        # without copying a view out of its buffer.
+        if self._value is None and self.pieces is None:
+            return self.buffer, self.start
+        return self.value, 0
+
+    def equals(self, other):
+        if self.length != other.length:
+            return False
+        if other._value is None and other.pieces is None:
+            self, other = other, self
+        buffer, start = self.text()
+        return buffer.startswith(other.value, start)
+
     def added_to(self, other):
         if isinstance(other, String):
-            return String(self.value + other.value).set_context(self.context), None
+            pieces = self.pieces
+            if pieces is not None and len(pieces) == self.piece_count:
+                pieces.append(other.value)
+            else:
+                pieces = [self.value, other.value]
+            result = String.from_pieces(pieces, len(pieces), self.length + other.length)
+            return result.set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
     
@@ -1499,12 +2208,61 @@ class String(Value):
             return String(self.value * other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
+
+    def divided_by(self, other):
+        # s / i is the character at i and s / [start, end] (or [start]
+        # for the rest of the string) is a view. Negative indices count
+        # from the end.
+        buffer, start = self.text()
+        if isinstance(other, Number) and type(other.value) is int:
+            index = other.value + self.length if other.value < 0 else other.value
+            if 0 <= index < self.length:
+                return String(buffer[start + index]).set_context(self.context), None
+        elif isinstance(other, List):
+            bounds = [bound.value if isinstance(bound, Number) else None for bound in other.vector]
+            if None in bounds or not all(type(bound) is int for bound in bounds) or not 1 <= len(bounds) <= 2:
+                return None, RunTimeError(
+                    other.start_pos, other.end_pos,
+                    "String index must be a number, [start] or [start, end]",
+                    self.context
+                )
+            first, last, step = slice(*bounds if len(bounds) == 2 else (bounds[0], None)).indices(self.length)
+            length = max(last - first, 0)
+            return String.view(buffer, start + first, length).set_context(self.context), None
+        else:
+            return None, Value.illegal_operation(self, other)
+        return None, RunTimeError(
+            other.start_pos, other.end_pos,
+            "Element at index {} does not exist!".format(other),
+            self.context
+        )
+
+    def get_comparison_eq(self, other):
+        if isinstance(other, String):
+            return Number(int(self.equals(other))).set_context(self.context), None
+        else:
+            return None, Value.illegal_operation(self, other)
+
+    def get_comparison_ne(self, other):
+        if isinstance(other, String):
+            return Number(int(not self.equals(other))).set_context(self.context), None
+        else:
+            return None, Value.illegal_operation(self, other)
     
     def is_true(self):
-        return len(self.value) > 0
+        return self.length > 0
+
+    def iterate(self):
+        buffer, start = self.text()
+        if start == 0 and self.length == len(buffer):
+            return map(String, buffer)
+        return map(String, map(buffer.__getitem__, range(start, start + self.length)))
     
     def copy(self):
-        copy = String(self.value)
+        copy = String.from_pieces(self.pieces, self.piece_count, self.length)
+        copy._value = self._value
+        copy.buffer = self.buffer
+        copy.start = self.start
         copy.set_pos(self.start_pos, self.end_pos)
         copy.set_context(self.context)
         return copy
@@ -1516,23 +2274,412 @@ class String(Value):
         return self.value
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-#BaseFunction Class
+#Map Value Class
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-class BaseFunction(Value):
-    def __init__(self, name):
+def map_key(key):
+    # Number and String keys are stored by their Python value, so 1 and 1.0
+    # are the same key and "1" is a different one.
+    if isinstance(key, Number):
+        return key.value
+    if isinstance(key, String):
+        return key.value
+    return None
+
+class Map(Value):
+    # Hash map from Number or String keys to values, backed by a dict in
+    # insertion order. Copies share the dict until one of them is changed
+    # by a built-in, which then takes its own copy first.
+    def __init__(self, entries=None):
         super().__init__()
-        self.name = name or '<anonymous>'
+        self.entries = {} if entries is None else entries
+        self.shared = False
 
-    def generate_new_context(self):
-        new_context = Context(self.name, self.context, self.start_pos)
-        new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
-        return new_context
-    
-    def check_args(self, arg_names, args):
-        res = RTResult()
-        if len(args) > len(arg_names):
-            return res.failure(RunTimeError(
-                self.start_pos, self.end_pos,
+    def writable_entries(self):
+        if self.shared:
+            self.entries = dict(self.entries)
+            self.shared = False
+        return self.entries
+
+    def key_error(self, key):
+        return RunTimeError(
+            key.start_pos, key.end_pos,
+            "Map keys must be numbers or strings",
+            self.context
+        )
+
+    def added_to(self, other):
+        if isinstance(other, Map):
+            return Map({**self.entries, **other.entries}).set_context(self.context), None
+        else:
+            return None, Value.illegal_operation(self, other)
+
+    def subtracted_by(self, other):
+        key = map_key(other)
+        if key is None:
+            return None, self.key_error(other)
+        if key not in self.entries:
+            return None, RunTimeError(
+                other.start_pos, other.end_pos,
+                "Key {} does not exist!".format(repr(other)),
+                self.context
+            )
+        entries = dict(self.entries)
+        del entries[key]
+        return Map(entries).set_context(self.context), None
+
+    def divided_by(self, other):
+        key = map_key(other)
+        if key is None:
+            return None, self.key_error(other)
+        value = self.entries.get(key)
+        if value is None:
+            return None, RunTimeError(
+                other.start_pos, other.end_pos,
+                "Key {} does not exist!".format(repr(other)),
+                self.context
+            )
+        return value, None
+
+    def is_true(self):
+        return len(self.entries) > 0
+
+    def iterate(self):
+        return map(from_python, self.entries)
+
+    def copy(self):
+        copy = Map(self.entries)
+        copy.shared = True
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
+
+    def __repr__(self):
+        return '{' + ", ".join(f'{repr(from_python(key))}: {repr(value)}' for key, value in self.entries.items()) + '}'
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Range Value Class
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Range(Value):
+    # Whole numbers from start up to end by step, like a For loop counts.
+    # Only the three bounds are stored (in a Python range), so length and
+    # r / i are computed and the numbers are made one at a time.
+    def __init__(self, values):
+        super().__init__()
+        self.range = values
+
+    def divided_by(self, other):
+        if isinstance(other, Number) and type(other.value) is int:
+            try:
+                return Number(self.range[other.value]).set_context(self.context), None
+            except IndexError:
+                pass
+        return None, RunTimeError(
+            other.start_pos, other.end_pos,
+            "Element at index {} does not exist!".format(other),
+            self.context
+        )
+
+    def length(self):
+        # len() of a Python range fails past sys.maxsize.
+        start, stop, step = self.range.start, self.range.stop, self.range.step
+        if step > 0:
+            return max((stop - start + step - 1) // step, 0)
+        return max((start - stop - step - 1) // -step, 0)
+
+    def is_true(self):
+        return bool(self.range)
+
+    def iterate(self):
+        return map(Number, self.range)
+
+    def copy(self):
+        copy = Range(self.range)
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
+
+    def __repr__(self):
+        return f'Range({self.range.start}, {self.range.stop}, {self.range.step})'
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Array Value Class
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+ARRAY_UFUNCS = {
+    T_PLUS: 'add',
+    T_MINUS: 'subtract',
+    T_MUL: 'multiply',
+    T_DIV: 'true_divide',
+    T_POW: 'power',
+    T_EE: 'equal',
+    T_NE: 'not_equal',
+    T_LT: 'less',
+    T_GT: 'greater',
+    T_LTE: 'less_equal',
+    T_GTE: 'greater_equal',
+    T_AND: 'logical_and',
+    T_OR: 'logical_or',
+}
+
+class Array(Value):
+    # Numeric array backed by a NumPy ndarray. Operators work elementwise
+    # against another Array or a Number; comparisons give arrays of 0/1.
+    # Dividing by a List indexes instead: a / [i] is element i and
+    # a / [start, end] or a / [start, end, step] is a slice sharing data.
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+
+    def elementwise(self, op, other, reflected=False):
+        if isinstance(other, Array):
+            other_data = other.data
+        elif isinstance(other, Number):
+            other_data = other.value
+        else:
+            return None, Value.illegal_operation(self, other)
+
+        left, right = (other_data, self.data) if reflected else (self.data, other_data)
+        if op == T_DIV and not numpy.all(right):
+            divisor = self if reflected else other
+            return None, RunTimeError(
+                divisor.start_pos, divisor.end_pos, 'Division by Zero', self.context
+            )
+        try:
+            data = getattr(numpy, ARRAY_UFUNCS[op])(left, right)
+        except (ValueError, TypeError) as exception:
+            return None, RunTimeError(self.start_pos, other.end_pos, str(exception), self.context)
+        if data.dtype == bool:
+            data = data.astype(numpy.int64)
+        return Array(data).set_context(self.context), None
+
+    def added_to(self, other):
+        return self.elementwise(T_PLUS, other)
+    def subtracted_by(self, other):
+        return self.elementwise(T_MINUS, other)
+    def multiplied_by(self, other):
+        return self.elementwise(T_MUL, other)
+    def powered_by(self, other):
+        return self.elementwise(T_POW, other)
+    def get_comparison_eq(self, other):
+        return self.elementwise(T_EE, other)
+    def get_comparison_ne(self, other):
+        return self.elementwise(T_NE, other)
+    def get_comparison_lt(self, other):
+        return self.elementwise(T_LT, other)
+    def get_comparison_gt(self, other):
+        return self.elementwise(T_GT, other)
+    def get_comparison_lte(self, other):
+        return self.elementwise(T_LTE, other)
+    def get_comparison_gte(self, other):
+        return self.elementwise(T_GTE, other)
+    def anded_by(self, other):
+        return self.elementwise(T_AND, other)
+    def ored_by(self, other):
+        return self.elementwise(T_OR, other)
+
+    def notted(self):
+        return Array(numpy.logical_not(self.data).astype(numpy.int64)).set_context(self.context), None
+
+    def divided_by(self, other):
+        if not isinstance(other, List):
+            return self.elementwise(T_DIV, other)
+        bounds = [bound.value if isinstance(bound, Number) else None for bound in other.vector]
+        if None in bounds or not 1 <= len(bounds) <= 3:
+            return None, RunTimeError(
+                other.start_pos, other.end_pos,
+                "Array index must be [index], [start, end] or [start, end, step]",
+                self.context
+            )
+        try:
+            if len(bounds) == 1:
+                return Number(self.data[bounds[0]].item()).set_context(self.context), None
+            return Array(self.data[slice(*bounds)]).set_context(self.context), None
+        except (IndexError, TypeError, ValueError):
+            return None, RunTimeError(
+                other.start_pos, other.end_pos,
+                "Element at index {} does not exist!".format(other),
+                self.context
+            )
+
+    def is_true(self):
+        return self.data.size > 0
+
+    def iterate(self):
+        return map(from_python, self.data.flat)
+
+    def copy(self):
+        copy = Array(self.data)
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
+
+    def __repr__(self):
+        return f'Array({self})'
+
+    def __str__(self):
+        return numpy.array2string(self.data, separator=', ')
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Buffer Value Class
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Buffer(Value):
+    # Raw bytes seen through a memoryview of a bytearray, bytes object,
+    # mmap or any other byte buffer. b / i is the byte at i as a number and
+    # b / [start, end] (or [start]) is a Buffer over the same memory, so
+    # slicing never copies. Whole integers and records are read and
+    # written with the struct built-ins.
+    def __init__(self, view):
+        super().__init__()
+        self.view = view
+
+    def divided_by(self, other):
+        length = len(self.view)
+        if isinstance(other, Number) and type(other.value) is int:
+            index = other.value + length if other.value < 0 else other.value
+            if 0 <= index < length:
+                return Number(self.view[index]).set_context(self.context), None
+        elif isinstance(other, List):
+            bounds = [bound.value if isinstance(bound, Number) else None for bound in other.vector]
+            if None in bounds or not all(type(bound) is int for bound in bounds) or not 1 <= len(bounds) <= 2:
+                return None, RunTimeError(
+                    other.start_pos, other.end_pos,
+                    "Buffer index must be a number, [start] or [start, end]",
+                    self.context
+                )
+            return Buffer(self.view[slice(*bounds if len(bounds) == 2 else (bounds[0], None))]).set_context(self.context), None
+        else:
+            return None, Value.illegal_operation(self, other)
+        return None, RunTimeError(
+            other.start_pos, other.end_pos,
+            "Element at index {} does not exist!".format(other),
+            self.context
+        )
+
+    def added_to(self, other):
+        if isinstance(other, Buffer):
+            return Buffer(memoryview(bytearray(self.view) + other.view)).set_context(self.context), None
+        else:
+            return None, Value.illegal_operation(self, other)
+
+    def get_comparison_eq(self, other):
+        if isinstance(other, Buffer):
+            return Number(int(self.view == other.view)).set_context(self.context), None
+        else:
+            return None, Value.illegal_operation(self, other)
+
+    def get_comparison_ne(self, other):
+        if isinstance(other, Buffer):
+            return Number(int(self.view != other.view)).set_context(self.context), None
+        else:
+            return None, Value.illegal_operation(self, other)
+
+    def is_true(self):
+        return len(self.view) > 0
+
+    def iterate(self):
+        return map(Number, self.view)
+
+    def copy(self):
+        copy = Buffer(self.view)
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
+
+    def __repr__(self):
+        return f"<buffer of {len(self.view)} bytes>"
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Python Values
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+BYTE_TYPES = (bytes, bytearray, mmap.mmap)
+BUFFER_TYPES = (bytes, bytearray, memoryview, array.array)
+
+def from_python(value):
+    # Converts a Python object into a Naive value without copying its data:
+    # lists become LazyLists over the same list, bytes, bytearrays, mmaps
+    # and byte memoryviews become Buffers, and NumPy arrays or other
+    # buffers become Arrays sharing their memory. Naive values pass through.
+    kind = type(value)
+    if kind is str:
+        return String(value)
+    if kind is int or kind is float:
+        return Number(value)
+    if isinstance(value, (Value, Number)):
+        return value
+    if value is None:
+        return Number.null
+    if isinstance(value, bool):
+        return Number(int(value))
+    if isinstance(value, (int, float)):
+        return Number(value)
+    if isinstance(value, str):
+        return String(value)
+    if isinstance(value, range):
+        return Range(value)
+    if isinstance(value, (list, tuple)):
+        lazy_list = LazyList(value)
+        lazy_list.from_python = True
+        return lazy_list
+    if isinstance(value, BYTE_TYPES) or isinstance(value, memoryview) and value.format in 'Bbc':
+        return Buffer(memoryview(value).cast('B'))
+    if isinstance(value, dict):
+        entries = {}
+        for key, element in value.items():
+            if not isinstance(key, (int, float, str)):
+                raise TypeError(f"Map keys must be numbers or strings, not {type(key).__name__}")
+            entries[key] = from_python(element)
+        return Map(entries)
+    if numpy is not None:
+        if isinstance(value, numpy.ndarray):
+            return Array(value)
+        if isinstance(value, numpy.generic):
+            return Number(value.item())
+        if isinstance(value, BUFFER_TYPES):
+            return Array(numpy.asarray(memoryview(value)))
+    raise TypeError(f"Cannot convert {type(value).__name__} to a Naive value")
+
+def to_python(value):
+    # Converts a Naive value back into a Python object. Arrays give their
+    # ndarray and untouched LazyLists give the list they were made from.
+    if isinstance(value, Number):
+        return value.value
+    if isinstance(value, String):
+        return value.value
+    if isinstance(value, Array):
+        return value.data
+    if isinstance(value, Buffer):
+        return value.view
+    if isinstance(value, Range):
+        return value.range
+    if isinstance(value, LazyList) and value.raw_elements is not None:
+        if value.from_python:
+            return value.raw_elements
+        return [to_python(from_python(element)) for element in value.raw_elements]
+    if isinstance(value, List):
+        return [to_python(element) for element in value.vector]
+    if isinstance(value, Map):
+        return {key: to_python(element) for key, element in value.entries.items()}
+    if isinstance(value, Record):
+        return {name: to_python(value.field(offset)) for offset, name in enumerate(value.record_type.field_names)}
+    return value
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#BaseFunction Class
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class BaseFunction(Value):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name or '<anonymous>'
+
+    def generate_new_context(self):
+        new_context = Context(self.name, self.context, self.start_pos)
+        new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
+        return new_context
+    
+    def check_args(self, arg_names, args):
+        res = RTResult()
+        if len(args) > len(arg_names):
+            return res.failure(RunTimeError(
+                self.start_pos, self.end_pos,
                 f"{len(args) - len(arg_names)} too many args passed into {self.name}",
                 self.context
             ))
@@ -1561,29 +2708,58 @@ class BaseFunction(Value):
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #Function Class
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+FRAME_POOL_SIZE = 32
+
 class Function(BaseFunction):
-    def __init__(self, name, body_node, arg_names, should_return_null):
+    # Calls run in frames (a Context and its SymbolTable) taken from
+    # frame_pool and given back once the call returns without an error.
+    # Bodies that define functions get no pool: those functions keep the
+    # frame they were defined in as their context.
+    def __init__(self, name, body_node, arg_names, should_return_null, frame_pool=None, is_generator=False):
         super().__init__(name)
         self.body_node = body_node
         self.arg_names = arg_names
+        self.arity = len(arg_names)
         self.should_return_null = should_return_null
-
-    def execute(self, args):
-        res = RTResult()
-        interpreter = Interpreter()
-        exec_ctx = self.generate_new_context()
-
-        res.register(self.check_and_populate_args(self.arg_names, args, exec_ctx))
-        if res.error: return res
-
-
-        value = res.register(interpreter.visit(self.body_node, exec_ctx))
-        if res.error:
-            return res
-        return res.success(value)
+        self.frame_pool = frame_pool
+        self.is_generator = is_generator
+
+    def new_frame(self):
+        frame = Context(self.name)
+        frame.symbol_table = SymbolTable()
+        return frame
+
+    def execute(self, args, arity_checked=False):
+        if not arity_checked and len(args) != self.arity:
+            return self.check_args(self.arg_names, args)
+
+        pool = self.frame_pool
+        frame = pool.pop() if pool else self.new_frame()
+        frame.parent = self.context
+        frame.parent_entry_pos = self.start_pos
+        symbol_table = frame.symbol_table
+        symbol_table.parent = self.context.symbol_table
+
+        symbols = symbol_table.symbols
+        for arg_name, arg_value in zip(self.arg_names, args):
+            arg_value.set_context(frame)
+            symbols[arg_name] = arg_value
+
+        if self.is_generator:
+            steps = self.generator_interpreter.run(self.body_node, frame)
+            return RTResult().success(Generator(self.name, steps).set_context(self.context))
+
+        res = self.interpreter.visit(self.body_node, frame)
+        if pool is not None and not res.error and len(pool) < FRAME_POOL_SIZE:
+            symbols.clear()
+            pool.append(frame)
+        return res
     
     def copy(self):
-        copy = Function(self.name, self.body_node, self.arg_names, self.should_return_null)
+        copy = Function(
+            self.name, self.body_node, self.arg_names, self.should_return_null,
+            self.frame_pool, self.is_generator
+        )
         copy.set_context(self.context)
         copy.set_pos(self.start_pos, self.end_pos)
         return copy
@@ -1594,152 +2770,216 @@ class Function(BaseFunction):
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #BuiltInFunction Class
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class BuiltInError(Exception):
+    # Raised by a native built-in to fail the call with a Run Time Error.
+    # Pass error to re-raise an existing Error (e.g. from a callback).
+    def __init__(self, details, error=None):
+        super().__init__(details)
+        self.details = details
+        self.error = error
+
 class BuiltInFunction(BaseFunction):
-    def __init__(self, name):
+    # Wraps a Python callable. The callable receives the argument values
+    # positionally and returns a value (None means null); see builtin().
+    def __init__(self, name, function, min_args, max_args):
         super().__init__(name)
+        self.function = function
+        self.min_args = min_args
+        self.max_args = max_args
     
     def execute(self, args):
-        res = RTResult()
-        exec_ctx = self.generate_new_context()
-
-        method_name = f'execute_{self.name}'
-        method = getattr(self, method_name, self.no_visit_method)
-        res.register(self.check_and_populate_args(method.arg_names, args, exec_ctx))
-        if res.error: return res
-
-        return_value = res.register(method(exec_ctx))
-        if res.error:
-            return res
-        
-        return res.success(return_value)
-    
-    def no_visit_method(self, node, context):
-        raise Exception(f'No execute_{self.name} method defined')
+        return self.call(args, self.start_pos, self.end_pos, self.context)
+
+    def call(self, args, start_pos, end_pos, context):
+        # Calls the built-in with errors reported at the given position,
+        # without needing a positioned copy of this value.
+        if len(args) < self.min_args or (self.max_args is not None and len(args) > self.max_args):
+            if len(args) < self.min_args:
+                details = f"{self.min_args - len(args)} too few args passed into {self.name}"
+            else:
+                details = f"{len(args) - self.max_args} too many args passed into {self.name}"
+            return RTResult().failure(RunTimeError(start_pos, end_pos, details, context))
+        try:
+            value = self.function(*args)
+        except BuiltInError as exception:
+            return RTResult().failure(exception.error or RunTimeError(
+                start_pos, end_pos, exception.details, context
+            ))
+        return RTResult().success(from_python(value))
 
     def copy(self):
-        copy = BuiltInFunction(self.name)
+        copy = BuiltInFunction(self.name, self.function, self.min_args, self.max_args)
         copy.set_context(self.context)
         copy.set_pos(self.start_pos, self.end_pos)
         return copy
     
     def __repr__(self) :
         return f"<built-in function {self.name} at {hex(id(self))}>"
-    
-    def execute_show(self, exec_ctx):
-        print(str(exec_ctx.symbol_table.get('value')))
-        return RTResult().success(Number.null)
-    execute_show.arg_names = ['value']
 
-    def execute_show_ret(self, exec_ctx):
-        return RTResult().success(String(str(exec_ctx.symbol_table.get('value'))))
-    execute_show_ret.arg_names = ['value']
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Record Value Class
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def field_equal(mine, theirs):
+    # Numbers are stored unboxed and compare as they are. Other fields use
+    # their own ==, except lists and maps, which have none and compare by
+    # content, and arrays, whose == is elementwise.
+    if mine is theirs:
+        return True
+    if type(mine) in (int, float) or type(theirs) in (int, float):
+        return mine == theirs
+    if isinstance(mine, (List, Map)) and isinstance(theirs, (List, Map)):
+        return to_python(mine) == to_python(theirs)
+    if isinstance(mine, Array) or isinstance(theirs, Array):
+        return isinstance(mine, Array) and isinstance(theirs, Array) and numpy.array_equal(mine.data, theirs.data)
+    result, error = mine.get_comparison_eq(theirs)
+    return error is None and result.is_true()
+
+class Record(Value):
+    # One row of a Record declaration. Field values sit in a tuple at the
+    # offsets fixed by the declaration; numbers are kept as plain Python
+    # numbers and only made into Number values when a field is read.
+    __slots__ = ('record_type', 'values')
+
+    def __init__(self, record_type, values):
+        super().__init__()
+        self.record_type = record_type
+        self.values = values
 
-    def execute_get(self, exec_ctx):
-        text = input()
-        return RTResult().success(String(text))
-    execute_get.arg_names = []
+    def field(self, offset):
+        value = self.values[offset]
+        if type(value) in (int, float):
+            return Number(value).set_context(self.context)
+        return value
 
-    def execute_get_int(self, exec_ctx):
+    def get_comparison_eq(self, other):
+        equal = (
+            isinstance(other, Record)
+            and self.record_type.offsets is other.record_type.offsets
+            and all(map(field_equal, self.values, other.values))
+        )
+        return Number(int(equal)).set_context(self.context), None
+
+    def get_comparison_ne(self, other):
+        equal, error = self.get_comparison_eq(other)
+        return Number(int(not equal.value)).set_context(self.context), None
+
+    def is_true(self):
+        return True
+
+    def copy(self):
+        copy = Record(self.record_type, self.values)
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
+
+    def __repr__(self):
+        fields = ", ".join(
+            f'{name}={repr(self.field(offset))}'
+            for offset, name in enumerate(self.record_type.field_names)
+        )
+        return f'{self.record_type.name}({fields})'
+
+class RecordType(BaseFunction):
+    # The value a Record declaration binds: calling it builds a Record.
+    # Copies share the declaration's offsets dict, which identifies the
+    # record type.
+    def __init__(self, name, field_names, offsets):
+        super().__init__(name)
+        self.field_names = field_names
+        self.offsets = offsets
+
+    def execute(self, args):
+        if len(args) != len(self.field_names):
+            return self.check_args(self.field_names, args)
+        values = tuple([arg.value if type(arg) is Number else arg for arg in args])
+        return RTResult().success(Record(self, values).set_context(self.context))
+
+    def copy(self):
+        copy = RecordType(self.name, self.field_names, self.offsets)
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
+
+    def __repr__(self):
+        return f"<record {self.name}({', '.join(self.field_names)})>"
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Generator Value Class
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Generator(Value):
+    # What calling a function containing Yield gives back. steps is the
+    # Python generator running the body in the GeneratorInterpreter; each
+    # value asked for runs the body up to its next Yield. A generator can
+    # be gone through only once.
+    def __init__(self, name, steps):
+        super().__init__()
+        self.name = name
+        self.steps = steps
+
+    def iterate(self):
+        return self.values()
+
+    def values(self):
+        # An error in the body ends the iteration with a BuiltInError
+        # carrying it, which For ... In and the built-ins report.
         while True:
-            text = input()
             try:
-                number = int(text)
-                break
-            except ValueError:
-                print(f"'{text}' must be an integer. Try again! ")
-        return RTResult().success(Number(number))
-    execute_get_int.arg_names = []
-
-    def execute_is_number(self, exec_ctx):
-        is_number = isinstance(exec_ctx.symbol_table.get("value"), Number)
-        return RTResult().success(Number.true if is_number else Number.false)
-    execute_is_number.arg_names = ['value']
-
-    def execute_is_string(self, exec_ctx):
-        is_string = isinstance(exec_ctx.symbol_table.get("value"), String)
-        return RTResult().success(Number.true if is_string else Number.false)
-    execute_is_string.arg_names = ['value']
-
-    def execute_is_list(self, exec_ctx):
-        is_list = isinstance(exec_ctx.symbol_table.get("value"), List)
-        return RTResult().success(Number.true if is_list else Number.false)
-    execute_is_list.arg_names = ['value']
-
-    def execute_is_function(self, exec_ctx):
-        is_function = isinstance(exec_ctx.symbol_table.get("value"), BaseFunction)
-        return RTResult().success(Number.true if is_function else Number.false)
-    execute_is_function.arg_names = ['value']
-
-    def execute_append(self, exec_ctx):
-        list_ = exec_ctx.symbol_table.get("list")
-        value = exec_ctx.symbol_table.get("value")
-        if not isinstance(list_, List):
-            return RTResult().failure(RunTimeError(
-                self.pos_start, self.pos_end,
-                "First argument must be list",
-                exec_ctx
-                ))
-        if not isinstance(value, (Number, String, List)):
-            return RTResult().failure(RunTimeError(
-                self.pos_start, self.pos_end,
-                "Second argument must be a string, number or list",
-                exec_ctx
-                ))
-        
-        list_.elements.append(value)
-        return RTResult().success(Number.null)
-    execute_append.arg_names = ['list', 'value']
+                value = next(self.steps)
+            except StopIteration as stop:
+                # A finished body returns its RTResult once; after that
+                # the value is None.
+                if stop.value is not None and stop.value.error:
+                    raise BuiltInError(stop.value.error.details, stop.value.error)
+                return
+            yield value
 
-    def execute_pop(self, exec_ctx):
-        list_ = exec_ctx.symbol_table.get("list")
-        index = exec_ctx.symbol_table.get("index")
-        if not isinstance(list_, List):
-            return RTResult().failure(RunTimeError(
-                self.pos_start, self.pos_end,
-                "First argument must be list",
-                exec_ctx
-                ))
+    def is_true(self):
+        return True
+
+    def copy(self):
+        copy = Generator(self.name, self.steps)
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
+
+    def __repr__(self):
+        return f"<generator {self.name} at {hex(id(self))}>"
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Stream Value Class
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Stream(Value):
+    # A lazy sequence read from outside the program, such as the lines of
+    # a file. make_values is called every time the stream is gone through
+    # and gives a Python iterator of values, so unlike a Generator a
+    # stream can be gone through again.
+    def __init__(self, description, make_values):
+        super().__init__()
+        self.description = description
+        self.make_values = make_values
+
+    def iterate(self):
+        return self.values()
+
+    def values(self):
         try:
-            element = list_.elements.pop(index.value)
-        except:
-            return RTResult().failure(RunTimeError(
-                self.pos_start, self.pos_end,
-                "List index out of range",
-                exec_ctx
-                ))
-        return RTResult().success(Number.null if element is None else element)
-    execute_pop.arg_names = ['list', 'index']
+            yield from self.make_values()
+        except OSError as exception:
+            raise BuiltInError(f"{self.description}: {exception.strerror or exception}")
+        except (UnicodeDecodeError, csv.Error) as exception:
+            raise BuiltInError(f"{self.description}: {exception}")
 
-    def execute_extend(self, exec_ctx):
-        listA = exec_ctx.symbol_table.get("listA")
-        listB = exec_ctx.symbol_table.get("listB")
-        if not isinstance(listA, List):
-            return RTResult().failure(RunTimeError(
-                self.pos_start, self.pos_end,
-                "First argument must be list",
-                exec_ctx
-                ))
-        if not isinstance(listB, List):
-            return RTResult().failure(RunTimeError(
-                self.pos_start, self.pos_end,
-                "Second argument must be list",
-                exec_ctx
-                ))
-        listA.elements.extend(listB.elements)
-        return RTResult().success(Number.null)
-    execute_extend.arg_names = ['listA', 'listB']
+    def is_true(self):
+        return True
+
+    def copy(self):
+        copy = Stream(self.description, self.make_values)
+        copy.set_context(self.context)
+        copy.set_pos(self.start_pos, self.end_pos)
+        return copy
 
-BuiltInFunction.show = BuiltInFunction("show")
-BuiltInFunction.show_ret = BuiltInFunction("show_ret")
-BuiltInFunction.get = BuiltInFunction("get")
-BuiltInFunction.get_int = BuiltInFunction("get_int")
-BuiltInFunction.is_number = BuiltInFunction("is_number")
-BuiltInFunction.is_string = BuiltInFunction("is_string")
-BuiltInFunction.is_list = BuiltInFunction("is_list")
-BuiltInFunction.is_function = BuiltInFunction("is_function")
-BuiltInFunction.append = BuiltInFunction("append")
-BuiltInFunction.pop = BuiltInFunction("pop")
-BuiltInFunction.extend = BuiltInFunction("extend")
+    def __repr__(self):
+        return f"<stream {self.description}>"
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #Context Class
@@ -1774,10 +3014,37 @@ class SymbolTable:
 #Interpreter
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class Interpreter:
+    # Set to False to bypass the inline caches and resolve every binary
+    # operation from scratch. Resolving is only a few type checks and a dict
+    # lookup, so the caches save just a few percent (see benchmark.py).
+    inline_caches = True
+
+    # And/Or skip their right operand when the left operand is a Number that
+    # already decides the result: 0 And x is 0, n Or x is n for any n != 0.
+    # Set to False for the old behaviour of always evaluating both sides.
+    short_circuit_logic = True
+
+    # visit_<NodeType> functions resolved once per node class instead of
+    # building the method name on every visit. Each subclass gets its own.
+    visit_methods = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.visit_methods = {}
+
     def visit(self, node, context):
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name, self.no_visit_method)
-        return method(node, context)
+        method = self.visit_methods.get(type(node))
+        if method is None:
+            method = self.visit_method(type(node))
+        return method(self, node, context)
+
+    @classmethod
+    def visit_method(cls, node_type):
+        method = cls.visit_methods.get(node_type)
+        if method is None:
+            method = getattr(cls, f'visit_{node_type.__name__}', cls.no_visit_method)
+            cls.visit_methods[node_type] = method
+        return method
     
     def no_visit_method(self, node, context):
         raise Exception(f'No visit_{type(node).__name__} method defined')
@@ -1795,6 +3062,10 @@ class Interpreter:
                 node.start_pos, node.end_pos,
                 f"'{elem_name}' is not defined", context
                 ))
+        if isinstance(value, (List, Map)):
+            # Lists and maps are handed out by reference so that built-ins
+            # like Append or MapSet update the value stored under this name.
+            return res.success(value.set_pos(node.start_pos, node.end_pos).set_context(context))
         value = value.copy().set_pos(node.start_pos, node.end_pos).set_context(context)
         return res.success(value)
     
@@ -1813,44 +3084,52 @@ class Interpreter:
         return res.success(value)
         
     def visit_BinaryOperationNode(self, node, context):
-        res = RTResult()
-
-        left = res.register(self.visit(node.left_node, context))
-        if res.error: return res
-        right = res.register(self.visit(node.right_node, context))
-        if res.error: return res
-
-        if node.op_token.type == T_PLUS:
-            result, error = left.added_to(right)
-        elif node.op_token.type == T_MINUS:
-            result, error = left.subtracted_by(right)
-        elif node.op_token.type == T_MUL:
-            result, error = left.multiplied_by(right)
-        elif node.op_token.type == T_DIV:
-            result, error = left.divided_by(right)
-        elif node.op_token.type == T_POW:
-            result, error = left.powered_by(right)
-        elif node.op_token.type == T_EE:
-            result, error = left.get_comparison_eq(right)
-        elif node.op_token.type == T_NE:
-            result, error = left.get_comparison_ne(right)
-        elif node.op_token.type == T_LT:
-            result, error = left.get_comparison_lt(right)
-        elif node.op_token.type == T_GT:
-            result, error = left.get_comparison_gt(right)
-        elif node.op_token.type == T_LTE:
-            result, error = left.get_comparison_lte(right)
-        elif node.op_token.type == T_GTE:
-            result, error = left.get_comparison_gte(right)
-        elif node.op_token.matches(T_KEYWORD, "And"):
-            result, error = left.anded_by(right)
-        elif node.op_token.matches(T_KEYWORD, "Or"):
-            result, error = left.ored_by(right)
+        left_res = self.visit(node.left_node, context)
+        if left_res.error: return left_res
+        if node.short_circuits and self.short_circuit_logic:
+            left = left_res.value
+            if type(left) is Number and bool(left.value) == (node.op == T_OR):
+                result = Number(int(left.value)).set_context(left.context)
+                return RTResult().success(result.set_pos(node.start_pos, node.end_pos))
+        right_res = self.visit(node.right_node, context)
+        if right_res.error: return right_res
+        left = left_res.value
+        right = right_res.value
+
+        left_type = type(left)
+        right_type = type(right)
+        if not self.inline_caches:
+            operation = resolve_binary_operation(node.op, left_type, right_type)
+        elif left_type is node.cache_left_type and right_type is node.cache_right_type:
+            operation = node.cache_operation
+        else:
+            operation = self.binary_cache_miss(node, left_type, right_type)
+        result, error = operation(left, right)
             
         if error:
-            return res.failure(error)
+            return RTResult().failure(error)
         else:
-            return res.success(result.set_pos(node.start_pos, node.end_pos))
+            return RTResult().success(result.set_pos(node.start_pos, node.end_pos))
+
+    def binary_cache_miss(self, node, left_type, right_type):
+        key = (left_type, right_type)
+        operation = node.cache_entries.get(key)
+        if operation is not None:
+            return operation
+
+        node.cache_misses += 1
+        operation = resolve_binary_operation(node.op, left_type, right_type)
+        if node.cache_megamorphic:
+            return operation
+        if node.cache_operation is None:
+            node.cache_left_type = left_type
+            node.cache_right_type = right_type
+            node.cache_operation = operation
+        elif len(node.cache_entries) < BINARY_CACHE_SIZE:
+            node.cache_entries[key] = operation
+        else:
+            node.cache_megamorphic = True
+        return operation
         
     def visit_UnaryOperationNode(self, node, context):
         res = RTResult()
@@ -1889,7 +3168,6 @@ class Interpreter:
     
     def visit_ForNode(self, node, context):
         res = RTResult()
-        elements = []
 
         start_value = res.register(self.visit(node.start_value_node, context))
         if res.error: return res
@@ -1904,6 +3182,14 @@ class Interpreter:
             step_value = Number(1)
 
         i = start_value.value
+        elements = None if node.should_return_null or node.value_unused else []
+
+        if (type(i) is int and type(end_value.value) is int
+                and type(step_value.value) is int and step_value.value != 0):
+            if node.rebinds_elem is None:
+                node.rebinds_elem = assigns_name(node.body_node, node.elem_name_token.value)
+            if not node.rebinds_elem:
+                return self.range_loop(node, range(i, end_value.value, step_value.value), elements, context)
 
         if step_value.value >= 0:
             condition = lambda: i < end_value.value
@@ -1913,29 +3199,108 @@ class Interpreter:
         while condition():
             context.symbol_table.set(node.elem_name_token.value, Number(i))
             i += step_value.value
-            elements.append(res.register(self.visit(node.body_node, context)))
+            value = res.register(self.visit(node.body_node, context))
             if res.error: return res
+            if elements is not None:
+                elements.append(value.value if type(value) is Number else value)
         
-        return res.success(
-            Number.null if node.should_return_null else
-            List(elements).set_context(context).set_pos(node.start_pos, node.end_pos)
-        )
+        return res.success(self.loop_result(node, elements, context))
+
+    def range_loop(self, node, values, elements, context):
+        # Fast path for integer For loops whose body never rebinds the loop
+        # element: iterates a Python range and rebinds one Number in place.
+        # This is safe because reading an element always returns a copy.
+        elem_name = node.elem_name_token.value
+        symbols = context.symbol_table.symbols
+        counter = Number(0)
+        statements = self.loop_statements(node, elements)
+
+        for i in values:
+            counter.value = i
+            symbols[elem_name] = counter
+            for visit, statement in statements:
+                body_res = visit(self, statement, context)
+                if body_res.error: return RTResult().failure(body_res.error)
+            if elements is not None:
+                value = body_res.value
+                elements.append(value.value if type(value) is Number else value)
+
+        return RTResult().success(self.loop_result(node, elements, context))
+
+    def visit_ForInNode(self, node, context):
+        res = RTResult()
+        iterable = res.register(self.visit(node.iterable_node, context))
+        if res.error: return res
+
+        elements = None if node.should_return_null or node.value_unused else []
+        if type(iterable) is Range:
+            if node.rebinds_elem is None:
+                node.rebinds_elem = assigns_name(node.body_node, node.elem_name_token.value)
+            if not node.rebinds_elem:
+                return self.range_loop(node, iterable.range, elements, context)
+
+        values = iterable.iterate()
+        if values is None:
+            return res.failure(RunTimeError(
+                node.iterable_node.start_pos, node.iterable_node.end_pos,
+                f"Cannot iterate over {iterable}", context
+            ))
+
+        elem_name = node.elem_name_token.value
+        symbols = context.symbol_table.symbols
+        statements = self.loop_statements(node, elements)
+
+        try:
+            for value in values:
+                symbols[elem_name] = value
+                for visit, statement in statements:
+                    body_res = visit(self, statement, context)
+                    if body_res.error: return res.failure(body_res.error)
+                if elements is not None:
+                    value = body_res.value
+                    elements.append(value.value if type(value) is Number else value)
+        except BuiltInError as exception:
+            # Raised by a Generator whose body failed or a Stream that
+            # could not be read.
+            return res.failure(exception.error or RunTimeError(
+                node.iterable_node.start_pos, node.iterable_node.end_pos,
+                exception.details, context
+            ))
+
+        return res.success(self.loop_result(node, elements, context))
+
+    def loop_statements(self, node, elements):
+        # The (visit method, node) pairs a loop runs for each element.
+        if elements is None and isinstance(node.body_node, ListNode):
+            # A block body whose value is discarded: run its statements
+            # directly instead of collecting them into a List every time,
+            # dropping bare literals which cannot have any effect.
+            return [
+                (self.visit_method(type(statement)), statement)
+                for statement in node.body_node.element_nodes
+                if not isinstance(statement, (NumberNode, StringNode))
+            ]
+        return [(self.visit_method(type(node.body_node)), node.body_node)]
 
     def visit_WhileNode(self, node, context):
         res = RTResult()
-        elements = []
+        elements = None if node.should_return_null or node.value_unused else []
         while True:
             condition_value = res.register(self.visit(node.condition_node, context))
             if res.error: return res
             if not condition_value.is_true():
                 break
-            elements.append(res.register(self.visit(node.body_node, context)))
+            value = res.register(self.visit(node.body_node, context))
             if res.error: return res
+            if elements is not None:
+                elements.append(value.value if type(value) is Number else value)
 
-        return res.success(
-            Number.null if node.should_return_null else
-            List(elements).set_context(context).set_pos(node.start_pos, node.end_pos)
-        )
+        return res.success(self.loop_result(node, elements, context))
+
+    def loop_result(self, node, elements, context):
+        if elements is None:
+            return Number.null
+        return LazyList(elements).set_context(context).set_pos(node.start_pos, node.end_pos)
     
     def visit_StringNode(self, node, context):
         return RTResult().success(
@@ -1954,6 +3319,33 @@ class Interpreter:
         )
         
     
+    def visit_MapNode(self, node, context):
+        res = RTResult()
+        entries = {}
+        for key_node, value_node in node.pair_nodes:
+            key = res.register(self.visit(key_node, context))
+            if res.error: return res
+            value = res.register(self.visit(value_node, context))
+            if res.error: return res
+            python_key = map_key(key)
+            if python_key is None:
+                return res.failure(RunTimeError(
+                    key.start_pos, key.end_pos,
+                    "Map keys must be numbers or strings",
+                    context
+                ))
+            entries[python_key] = value
+
+        return res.success(
+            Map(entries).set_context(context).set_pos(node.start_pos, node.end_pos)
+        )
+
+    def visit_YieldNode(self, node, context):
+        return RTResult().failure(RunTimeError(
+            node.start_pos, node.end_pos,
+            "Yield can only be used inside Define", context
+        ))
+
     def visit_FunctionDefinitionNode(self, node, context):
         res = RTResult()
 
@@ -1961,33 +3353,214 @@ class Interpreter:
         body_node = node.func_body_node
         arg_names = [arg_name.value for arg_name in node.func_params]
 
-        func_value = Function(func_name, body_node, arg_names, node.should_return_null).set_context(context).set_pos()
+        func_value = Function(
+            func_name, body_node, arg_names, node.should_return_null,
+            node.frame_pool, node.is_generator
+        ).set_context(context).set_pos(node.start_pos, node.end_pos)
 
         if node.func_name_token:
             context.symbol_table.set(func_name, func_value)
         
         return res.success(func_value)
     
+    def visit_RecordDefinitionNode(self, node, context):
+        record_name = node.record_name_token.value
+        field_names = [token.value for token in node.field_tokens]
+        record_type = RecordType(
+            record_name, field_names, node.offsets
+        ).set_context(context).set_pos(node.start_pos, node.end_pos)
+        context.symbol_table.set(record_name, record_type)
+        return RTResult().success(record_type)
+
+    def visit_FieldAccessNode(self, node, context):
+        res = RTResult()
+        record = res.register(self.visit(node.record_node, context))
+        if res.error: return res
+
+        if type(record) is not Record:
+            return res.failure(RunTimeError(
+                node.start_pos, node.end_pos,
+                f"{record} is not a record", context
+            ))
+        offsets = record.record_type.offsets
+        if offsets is not node.cache_offsets:
+            offset = offsets.get(node.field_name_token.value)
+            if offset is None:
+                return res.failure(RunTimeError(
+                    node.field_name_token.start_pos, node.end_pos,
+                    f"{record.record_type.name} has no field '{node.field_name_token.value}'", context
+                ))
+            node.cache_offsets = offsets
+            node.cache_offset = offset
+        return res.success(record.field(node.cache_offset).set_pos(node.start_pos, node.end_pos))
+
     def visit_CallNode(self, node, context):
         res = RTResult()
         args = []
 
+        if type(node.node_to_call) is ElementAccessNode:
+            callee = context.symbol_table.get(node.node_to_call.elem_name_token.value)
+            if type(callee) is BuiltInFunction:
+                # Built-ins are called straight from the symbol table.
+                for arg_node in node.func_params:
+                    args.append(res.register(self.visit(arg_node, context)))
+                    if res.error: return res
+                return_value = res.register(callee.call(args, node.start_pos, node.end_pos, context))
+                if res.error: return res
+                if not isinstance(return_value, (List, Map)):
+                    # Lists and maps come back by reference, as from element access.
+                    return_value = return_value.copy()
+                return res.success(return_value.set_pos(node.start_pos, node.end_pos).set_context(context))
+            if type(callee) is RecordType and len(node.func_params) == len(callee.field_names):
+                # So are record constructors; the new record needs no copy.
+                for arg_node in node.func_params:
+                    args.append(res.register(self.visit(arg_node, context)))
+                    if res.error: return res
+                record = res.register(callee.execute(args))
+                return res.success(record.set_pos(node.start_pos, node.end_pos).set_context(context))
+
         value_to_call = res.register(self.visit(node.node_to_call, context))
         if res.error: return res
-        value_to_call = value_to_call.copy().set_pos(node.start_pos, node.end_pos)
+        if isinstance(node.node_to_call, ElementAccessNode):
+            # Reading a name already returned a fresh copy.
+            value_to_call.set_pos(node.start_pos, node.end_pos)
+        else:
+            value_to_call = value_to_call.copy().set_pos(node.start_pos, node.end_pos)
 
         for arg_node in node.func_params:
             args.append(res.register(self.visit(arg_node, context)))
             if res.error: return res
 
-        return_value = res.register(value_to_call.execute(args))
-        if res.error: return res
-        return_value = return_value.copy().set_pos(node.start_pos, node.end_pos).set_context(context)
+        if type(value_to_call) is Function:
+            arity_checked = value_to_call.body_node is node.checked_body_node
+            call_res = value_to_call.execute(args, arity_checked)
+            if call_res.error: return call_res
+            node.checked_body_node = value_to_call.body_node
+            return_value = call_res.value
+        else:
+            return_value = res.register(value_to_call.execute(args))
+            if res.error: return res
+        if not isinstance(return_value, (List, Map)):
+            return_value = return_value.copy()
+        return_value = return_value.set_pos(node.start_pos, node.end_pos).set_context(context)
 
         return res.success(return_value)
 
+Function.interpreter = Interpreter()
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-#Run
+#Generator Interpreter
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class GeneratorInterpreter:
+    # Runs the bodies of functions containing Yield. Nodes with a Yield
+    # inside are run by the methods below, which are Python generators: a
+    # Yield hands its value out through every enclosing node and the whole
+    # body stays suspended until the next value is asked for. Nodes
+    # without a Yield are run by the normal Interpreter. Loops that contain
+    # a Yield evaluate to null instead of collecting a list.
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def run(self, node, context):
+        # Yields the values node yields and returns its RTResult.
+        if not node.contains_yield:
+            return self.interpreter.visit(node, context)
+        return (yield from getattr(self, f'run_{type(node).__name__}')(node, context))
+
+    def run_YieldNode(self, node, context):
+        res = yield from self.run(node.value_node, context)
+        if res.error: return res
+        yield res.value
+        return RTResult().success(Number.null)
+
+    def run_ListNode(self, node, context):
+        element_values = []
+        for element_node in node.element_nodes:
+            res = yield from self.run(element_node, context)
+            if res.error: return res
+            element_values.append(res.value)
+        return RTResult().success(
+            List(element_values).set_context(context).set_pos(node.start_pos, node.end_pos)
+        )
+
+    def run_IfNode(self, node, context):
+        for condition, expr, should_return_null in node.cases:
+            res = yield from self.run(condition, context)
+            if res.error: return res
+            if res.value.is_true():
+                res = yield from self.run(expr, context)
+                if res.error: return res
+                return RTResult().success(Number.null if should_return_null else res.value)
+
+        if node.else_case:
+            expression, should_return_null = node.else_case
+            res = yield from self.run(expression, context)
+            if res.error: return res
+            return RTResult().success(Number.null if should_return_null else res.value)
+
+        return RTResult().success(Number.null)
+
+    def run_ForNode(self, node, context):
+        bounds = []
+        for bound_node in (node.start_value_node, node.end_value_node, node.step_value_node):
+            if bound_node is None:
+                bounds.append(Number(1))
+                continue
+            res = yield from self.run(bound_node, context)
+            if res.error: return res
+            bounds.append(res.value)
+        i, end, step = [bound.value for bound in bounds]
+
+        while i < end if step >= 0 else i > end:
+            context.symbol_table.set(node.elem_name_token.value, Number(i))
+            i += step
+            res = yield from self.run(node.body_node, context)
+            if res.error: return res
+
+        return RTResult().success(Number.null)
+
+    def run_ForInNode(self, node, context):
+        res = yield from self.run(node.iterable_node, context)
+        if res.error: return res
+        iterable = res.value
+
+        values = iterable.iterate()
+        if values is None:
+            return RTResult().failure(RunTimeError(
+                node.iterable_node.start_pos, node.iterable_node.end_pos,
+                f"Cannot iterate over {iterable}", context
+            ))
+
+        try:
+            for value in values:
+                context.symbol_table.set(node.elem_name_token.value, value)
+                res = yield from self.run(node.body_node, context)
+                if res.error: return res
+        except BuiltInError as exception:
+            return RTResult().failure(exception.error or RunTimeError(
+                node.iterable_node.start_pos, node.iterable_node.end_pos,
+                exception.details, context
+            ))
+
+        return RTResult().success(Number.null)
+
+    def run_WhileNode(self, node, context):
+        while True:
+            res = yield from self.run(node.condition_node, context)
+            if res.error: return res
+            if not res.value.is_true():
+                break
+            res = yield from self.run(node.body_node, context)
+            if res.error: return res
+
+        return RTResult().success(Number.null)
+
+GENERATOR_NODES = (YieldNode, ListNode, IfNode, ForNode, ForInNode, WhileNode)
+
+Function.generator_interpreter = GeneratorInterpreter(Function.interpreter)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Global Symbol Table
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 global_symbol_table = SymbolTable()
@@ -1995,21 +3568,1258 @@ global_symbol_table.set("null", Number.null)
 global_symbol_table.set("true", Number.true)
 global_symbol_table.set("false", Number.false)
 global_symbol_table.set("PI", Number.PI)
-global_symbol_table.set("Show", BuiltInFunction.show)
-global_symbol_table.set("ShowRet", BuiltInFunction.show_ret)
-global_symbol_table.set("Get", BuiltInFunction.get)
-global_symbol_table.set("GetInt", BuiltInFunction.get_int)
-global_symbol_table.set("IsNumber", BuiltInFunction.is_number)
-global_symbol_table.set("IsString", BuiltInFunction.is_string)
-global_symbol_table.set("IsList", BuiltInFunction.is_list)
-global_symbol_table.set("IsFunction", BuiltInFunction.is_function)
-global_symbol_table.set("Append", BuiltInFunction.append)
-global_symbol_table.set("Pop", BuiltInFunction.pop)
-global_symbol_table.set("Extend", BuiltInFunction.extend)
 
+def builtin(name, symbol_table=None):
+    # Decorator registering a Python function as the Naive built-in name:
+    #
+    #     @naive.builtin("Double")
+    #     def double(value):
+    #         if not isinstance(value, naive.Number):
+    #             raise naive.BuiltInError("Argument must be a number")
+    #         return value.value * 2
+    #
+    # Parameters with defaults are optional and *args accepts any number of
+    # arguments. Python values returned are converted with from_python.
+    def register(function):
+        min_args, max_args = 0, 0
+        for parameter in inspect.signature(function).parameters.values():
+            if parameter.kind == parameter.VAR_POSITIONAL:
+                max_args = None
+            elif parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+                max_args += 1
+                if parameter.default is parameter.empty:
+                    min_args += 1
+        (symbol_table or global_symbol_table).set(name, BuiltInFunction(name, function, min_args, max_args))
+        return function
+    return register
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Built-in Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+@builtin("Show")
+def builtin_show(value):
+    print(str(value))
+
+@builtin("ShowRet")
+def builtin_show_ret(value):
+    return String(str(value))
+
+@builtin("Get")
+def builtin_get():
+    return String(input())
+
+@builtin("GetInt")
+def builtin_get_int():
+    while True:
+        text = input()
+        try:
+            return Number(int(text))
+        except ValueError:
+            print(f"'{text}' must be an integer. Try again! ")
+
+@builtin("IsNumber")
+def builtin_is_number(value):
+    return Number.true if isinstance(value, Number) else Number.false
+
+@builtin("IsString")
+def builtin_is_string(value):
+    return Number.true if isinstance(value, String) else Number.false
+
+@builtin("IsList")
+def builtin_is_list(value):
+    return Number.true if isinstance(value, List) else Number.false
+
+@builtin("IsFunction")
+def builtin_is_function(value):
+    return Number.true if isinstance(value, BaseFunction) else Number.false
+
+@builtin("Append")
+def builtin_append(list_, value):
+    if not isinstance(list_, List):
+        raise BuiltInError("First argument must be list")
+    if not isinstance(value, (Value, Number)):
+        raise BuiltInError("Second argument must be a Naive value")
+    list_.vector = list_.vector.append(value)
+
+@builtin("Pop")
+def builtin_pop(list_, index):
+    if not isinstance(list_, List):
+        raise BuiltInError("First argument must be list")
+    try:
+        element = list_.vector[index.value]
+        list_.vector = list_.vector.pop(index.value)
+    except:
+        raise BuiltInError("List index out of range")
+    return element
+
+@builtin("Extend")
+def builtin_extend(listA, listB):
+    if not isinstance(listA, List):
+        raise BuiltInError("First argument must be list")
+    if not isinstance(listB, List):
+        raise BuiltInError("Second argument must be list")
+    listA.vector = listA.vector.extend(listB.vector)
+
+def plain_values(list_):
+    # The elements of a list with numbers and strings as Python values, so
+    # that bulk built-ins can hand them to Python's C code in one go.
+    if isinstance(list_, LazyList) and list_.raw_elements is not None:
+        elements = list_.raw_elements
+    elif isinstance(list_, List):
+        elements = list_.vector
+    else:
+        elements, count = list_elements(list_)
+    return [
+        element.value if type(element) is Number or type(element) is String else element
+        for element in elements
+    ]
+
+def list_or_string(value):
+    if not isinstance(value, (List, String)):
+        raise BuiltInError("First argument must be list or string")
+
+def call_function(function, args):
+    # Calls a Naive function from a built-in and gives back its value. A
+    # failing call fails the built-in with the callee's own error.
+    res = function.execute(args)
+    if res.error:
+        raise BuiltInError(res.error.details, res.error)
+    return res.value
+
+def list_elements(list_):
+    # The elements of a list, range, generator or stream as values and how
+    # many there are, without materializing a LazyList or Range. Generators
+    # and streams are read as the elements are asked for, so their count
+    # is None.
+    if isinstance(list_, Range):
+        return map(Number, list_.range), list_.length()
+    if isinstance(list_, (Generator, Stream)):
+        return list_.iterate(), None
+    if not isinstance(list_, List):
+        raise BuiltInError("First argument must be list, range, generator or stream")
+    if isinstance(list_, LazyList) and list_.raw_elements is not None:
+        return map(from_python, list_.raw_elements), len(list_.raw_elements)
+    return iter(list_.vector), len(list_.vector)
+
+def element_caller(function, arity):
+    # Resolves function once and gives back call(args) for running it on
+    # element after element. A Function runs every call in one frame,
+    # cleared in between, unless its body defines functions that could
+    # keep the frame as their context.
+    if not isinstance(function, BaseFunction):
+        raise BuiltInError("Second argument must be function")
+    if type(function) is not Function or function.frame_pool is None:
+        return lambda args: call_function(function, args)
+    if function.arity != arity:
+        raise BuiltInError(function.check_args(function.arg_names, [None] * arity).error.details)
+
+    frame = function.new_frame()
+    frame.parent = function.context
+    frame.parent_entry_pos = function.start_pos
+    frame.symbol_table.parent = function.context.symbol_table
+    symbols = frame.symbol_table.symbols
+    arg_names = function.arg_names
+    body_node = function.body_node
+    visit = function.interpreter.visit
+
+    def call(args):
+        symbols.clear()
+        for arg_name, arg_value in zip(arg_names, args):
+            arg_value.set_context(frame)
+            symbols[arg_name] = arg_value
+        res = visit(body_node, frame)
+        if res.error:
+            raise BuiltInError(res.error.details, res.error)
+        return res.value
+    return call
+
+def lazy_like(list_, name, make_values):
+    # Map and Filter over a stream give a stream, read again each time it
+    # is gone through, and over a generator a generator, so neither holds
+    # more than one element. make_values() gives the Python iterator.
+    if isinstance(list_, Stream):
+        return Stream(f'{name}({list_.description})', make_values)
+    return Generator(name, make_values())
+
+def mapped_values(elements, function):
+    call = element_caller(function, 1)
+    for element in elements:
+        yield call([element])
+
+def filtered_values(elements, function):
+    call = element_caller(function, 1)
+    for element in elements:
+        if call([element]).is_true():
+            yield element
+
+@builtin("Map")
+def builtin_map(list_, function):
+    elements, count = list_elements(list_)
+    call = element_caller(function, 1)
+    if count is None:
+        return lazy_like(list_, 'Map', lambda: mapped_values(list_.iterate(), function))
+    try:
+        results = [None] * count
+    except (OverflowError, MemoryError):
+        raise BuiltInError(f"Too many elements ({count}) to make a list")
+    for index, element in enumerate(elements):
+        value = call([element])
+        results[index] = value.value if type(value) is Number else value
+    return LazyList(results)
+
+@builtin("Filter")
+def builtin_filter(list_, function):
+    elements, count = list_elements(list_)
+    call = element_caller(function, 1)
+    if count is None:
+        return lazy_like(list_, 'Filter', lambda: filtered_values(list_.iterate(), function))
+    return LazyList([element for element in elements if call([element]).is_true()])
+
+@builtin("Reduce")
+def builtin_reduce(list_, function, initial=None):
+    elements, count = list_elements(list_)
+    call = element_caller(function, 2)
+    if initial is None:
+        initial = next(elements, None)
+        if initial is None:
+            raise BuiltInError("Cannot reduce an empty list without an initial value")
+    result = initial
+    for element in elements:
+        result = call([result, element])
+    return result
+
+@builtin("Len")
+def builtin_len(value):
+    if isinstance(value, LazyList) and value.raw_elements is not None:
+        return len(value.raw_elements)
+    if isinstance(value, List):
+        return len(value.vector)
+    if isinstance(value, String):
+        return value.length
+    if isinstance(value, Map):
+        return len(value.entries)
+    if isinstance(value, Array):
+        data = value.data
+        return data.shape[0] if data.ndim else 1
+    if isinstance(value, Range):
+        return value.length()
+    if isinstance(value, Buffer):
+        return len(value.view)
+    raise BuiltInError("Argument must be list, string, map, array, range or buffer")
+
+def folded_values(list_):
+    # Like plain_values, but generators and streams are read one element
+    # at a time for built-ins that only need to go through them once.
+    if isinstance(list_, (Generator, Stream)):
+        return (
+            element.value if type(element) is Number or type(element) is String else element
+            for element in list_.iterate()
+        )
+    return plain_values(list_)
+
+@builtin("Sum")
+def builtin_sum(list_):
+    try:
+        return sum(folded_values(list_))
+    except TypeError:
+        raise BuiltInError("List elements must all be numbers")
+
+def extreme(list_, function):
+    empty = object()
+    try:
+        value = function(folded_values(list_), default=empty)
+    except TypeError:
+        raise BuiltInError("List elements must all be numbers or all be strings")
+    if value is empty:
+        raise BuiltInError("List is empty")
+    return value
+
+@builtin("Min")
+def builtin_min(list_):
+    return extreme(list_, min)
+
+@builtin("Max")
+def builtin_max(list_):
+    return extreme(list_, max)
+
+@builtin("Sort")
+def builtin_sort(list_, key=None):
+    # Gives a new sorted list. key is a function applied once per element.
+    if key is None:
+        values = plain_values(list_)
+        try:
+            values.sort()
+        except TypeError:
+            raise BuiltInError("List elements must all be numbers or all be strings")
+        return LazyList(values)
+    if not isinstance(key, BaseFunction):
+        raise BuiltInError("Second argument must be function")
+    elements = list(list_elements(list_)[0])
+    keys = [call_function(key, [element]) for element in elements]
+    keys = [key.value if type(key) is Number or type(key) is String else key for key in keys]
+    try:
+        order = sorted(range(len(elements)), key=keys.__getitem__)
+    except TypeError:
+        raise BuiltInError("Keys must all be numbers or all be strings")
+    return List([elements[index] for index in order])
+
+@builtin("Reverse")
+def builtin_reverse(value):
+    list_or_string(value)
+    if isinstance(value, String):
+        return value.value[::-1]
+    if isinstance(value, LazyList) and value.raw_elements is not None:
+        return LazyList(value.raw_elements[::-1])
+    return List(value.vector.to_list()[::-1])
+
+@builtin("IndexOf")
+def builtin_index_of(value, item):
+    # Index of the first element equal to item, or -1.
+    list_or_string(value)
+    if isinstance(value, String):
+        if not isinstance(item, String):
+            raise BuiltInError("Second argument must be string")
+        return value.value.find(item.value)
+    target = item.value if type(item) is Number or type(item) is String else item
+    try:
+        return plain_values(value).index(target)
+    except ValueError:
+        return -1
+
+@builtin("Contains")
+def builtin_contains(value, item):
+    # Binary search, so a list must already be sorted (see Sort).
+    list_or_string(value)
+    if isinstance(value, String):
+        if not isinstance(item, String):
+            raise BuiltInError("Second argument must be string")
+        return Number.true if item.value in value.value else Number.false
+    values = plain_values(value)
+    target = item.value if type(item) is Number or type(item) is String else item
+    try:
+        index = bisect.bisect_left(values, target)
+    except TypeError:
+        raise BuiltInError("List elements must all be numbers or all be strings")
+    return Number.true if index < len(values) and values[index] == target else Number.false
+
+def string_argument(value, position="First"):
+    if not isinstance(value, String):
+        raise BuiltInError(f"{position} argument must be string")
+    return value.value
+
+@builtin("Split")
+def builtin_split(string_, separator=None):
+    text = string_argument(string_)
+    if separator is None:
+        return LazyList(text.split())
+    separator = string_argument(separator, "Second")
+    if not separator:
+        raise BuiltInError("Separator must not be empty")
+    return LazyList(text.split(separator))
+
+@builtin("Join")
+def builtin_join(list_, separator=None):
+    glue = "" if separator is None else string_argument(separator, "Second")
+    values = plain_values(list_)
+    if not all(type(value) is str for value in values):
+        raise BuiltInError("List elements must all be strings")
+    return glue.join(values)
+
+@builtin("Find")
+def builtin_find(string_, part, start=None):
+    # Position of the first part at or after start, or -1.
+    text = string_argument(string_)
+    if start is not None and not (isinstance(start, Number) and type(start.value) is int):
+        raise BuiltInError("Third argument must be a whole number")
+    return text.find(string_argument(part, "Second"), 0 if start is None else start.value)
+
+@builtin("Replace")
+def builtin_replace(string_, old, new):
+    return string_argument(string_).replace(string_argument(old, "Second"), string_argument(new, "Third"))
+
+@builtin("Upper")
+def builtin_upper(string_):
+    return string_argument(string_).upper()
+
+@builtin("Lower")
+def builtin_lower(string_):
+    return string_argument(string_).lower()
+
+REGEX_CACHE_SIZE = 128
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_pattern(pattern):
+    # Compiled patterns are kept so a Match in a loop compiles once;
+    # compile_pattern.cache_info() (or RegexCacheInfo()) gives the counts.
+    try:
+        return re.compile(pattern)
+    except re.error as exception:
+        raise BuiltInError(f"Invalid pattern: {exception}")
+
+@builtin("Match")
+def builtin_match(string_, pattern):
+    # The first match as [whole match, group 1, ...], or null.
+    match = compile_pattern(string_argument(pattern, "Second")).search(string_argument(string_))
+    if match is None:
+        return None
+    return LazyList([match.group(0), *match.groups()])
+
+@builtin("FindAll")
+def builtin_find_all(string_, pattern):
+    # Every match; with groups in the pattern each is a list of the groups.
+    return LazyList(compile_pattern(string_argument(pattern, "Second")).findall(string_argument(string_)))
+
+@builtin("RegexCacheInfo")
+def builtin_regex_cache_info():
+    info = compile_pattern.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+FILE_BUFFER_SIZE = 1 << 20
+
+def path_argument(path):
+    if not isinstance(path, String):
+        raise BuiltInError("First argument must be a path string")
+    return path.value
+
+def file_error(action, path, exception):
+    # Decoding errors have no strerror.
+    return BuiltInError(f"Cannot {action} {path}: {getattr(exception, 'strerror', None) or exception}")
+
+@builtin("ReadFile")
+def builtin_read_file(path):
+    path = path_argument(path)
+    try:
+        with open(path, encoding='utf-8', newline='') as file:
+            return file.read()
+    except (OSError, UnicodeDecodeError) as exception:
+        raise file_error("read", path, exception)
+
+def write_file(path, value, mode):
+    # Writes a string as it is, or the elements of a list, range, generator
+    # or stream one per line, through a large write buffer.
+    path = path_argument(path)
+    try:
+        with open(path, mode, encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as file:
+            if isinstance(value, String):
+                file.write(value.value)
+                return
+            elements, count = list_elements(value)
+            for element in elements:
+                file.write(f'{element}\n')
+    except OSError as exception:
+        raise file_error("write", path, exception)
+
+@builtin("WriteFile")
+def builtin_write_file(path, value):
+    write_file(path, value, 'w')
+
+@builtin("AppendFile")
+def builtin_append_file(path, value):
+    write_file(path, value, 'a')
+
+def file_lines(path):
+    # Lines of a file without their line endings. The file is memory-mapped
+    # and each line decoded on its own, so only the current line is held.
+    with open(path, 'rb') as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty files cannot be mapped
+        with mapped:
+            for line in iter(mapped.readline, b''):
+                yield String(line.decode('utf-8').rstrip('\r\n'))
+
+@builtin("Lines")
+def builtin_lines(path):
+    path = path_argument(path)
+    return Stream(f'Lines("{path}")', lambda: file_lines(path))
+
+# Plain decimal numbers only: int() and float() would also take "1_000",
+# " 12 ", "nan" and "inf", which should stay strings.
+CSV_NUMBER = re.compile(r'[-+]?(?:[0-9]+(\.[0-9]*)?|(\.)[0-9]+)([eE][-+]?[0-9]+)?')
+
+def csv_value(cell):
+    match = CSV_NUMBER.fullmatch(cell)
+    if match is None:
+        return cell
+    if match.lastindex is None:
+        return int(cell)
+    return float(cell)
+
+def csv_rows(path, typed):
+    # Each row is a LazyList over the cells csv.reader gives back, so no
+    # cell becomes a String value until it is read.
+    with open(path, encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as file:
+        if typed:
+            for row in csv.reader(file):
+                yield LazyList([csv_value(cell) for cell in row])
+        else:
+            yield from map(LazyList, csv.reader(file))
+
+@builtin("CsvRows")
+def builtin_csv_rows(path, typed=None):
+    # Rows of a CSV file as lists of strings; with typed true, cells that
+    # look like numbers become numbers.
+    path = path_argument(path)
+    typed = typed is not None and typed.is_true()
+    return Stream(f'CsvRows("{path}")', lambda: csv_rows(path, typed))
+
+@builtin("CsvWrite")
+def builtin_csv_write(path, rows):
+    path = path_argument(path)
+    elements, count = list_elements(rows)
+    def cells(row):
+        if not isinstance(row, List):
+            raise BuiltInError("Every row must be a list")
+        return plain_values(row)
+    try:
+        with open(path, 'w', encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as file:
+            csv.writer(file).writerows(map(cells, elements))
+    except OSError as exception:
+        raise file_error("write", path, exception)
+
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_NUMBER_TAIL = re.compile(r'[-+.eE0-9]*')
+
+@builtin("JsonParse")
+def builtin_json_parse(text):
+    # Arrays become lists over the decoded Python lists, so their elements
+    # are only turned into values when they are read.
+    # Converted here, not on return, so that a RecursionError from deeply
+    # nested objects is caught as well.
+    try:
+        return from_python(json.loads(string_argument(text)))
+    except json.JSONDecodeError as exception:
+        raise BuiltInError(f"Invalid JSON: {exception}")
+    except RecursionError:
+        raise BuiltInError("Invalid JSON: nested too deeply")
+
+def json_default(value):
+    # to_python turns a Range into a Python range, which json cannot write.
+    if isinstance(value, range):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+@builtin("JsonDump")
+def builtin_json_dump(value, indent=None):
+    if indent is not None:
+        if not isinstance(indent, Number) or not isinstance(indent.value, int):
+            raise BuiltInError("Second argument must be an integer indent")
+        indent = indent.value
+    try:
+        return json.dumps(to_python(value), indent=indent, ensure_ascii=False, default=json_default)
+    except (TypeError, ValueError) as exception:
+        raise BuiltInError(f"Cannot write as JSON: {exception}")
+    except RecursionError:
+        raise BuiltInError("Cannot write as JSON: nested too deeply")
+
+def json_items(path):
+    # Decodes one element of the top-level array at a time with
+    # raw_decode, reading more of the file only when the buffer runs out
+    # in the middle of an element. Reads grow with the buffer so a single
+    # large element is still decoded in linear time.
+    decode = json.JSONDecoder().raw_decode
+    with open(path, encoding='utf-8', buffering=FILE_BUFFER_SIZE) as file:
+        buffer, pos, at_end = '', 0, False
+
+        def read_more():
+            nonlocal buffer, pos, at_end
+            chunk = file.read(max(FILE_BUFFER_SIZE, len(buffer) - pos))
+            at_end = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            return not at_end
+
+        def next_char():
+            nonlocal pos
+            while True:
+                pos = JSON_WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not read_more():
+                    return None
+
+        def invalid(expected):
+            found = next_char()
+            found = 'end of file' if found is None else repr(found)
+            raise BuiltInError(f'Invalid JSON in "{path}": expected {expected}, found {found}')
+
+        if next_char() != '[':
+            invalid("'[' at the start of a top-level array")
+        pos += 1
+        if next_char() == ']':
+            return
+        while True:
+            if next_char() is None:
+                invalid("an array element")
+            while True:
+                try:
+                    element, end = decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if read_more():
+                        continue
+                    invalid("an array element")
+                except RecursionError:
+                    raise BuiltInError(f'Invalid JSON in "{path}": element nested too deeply')
+                # A number running up to the end of the buffer may go on
+                # in the next read, so it is decoded again with more text.
+                if at_end or JSON_NUMBER_TAIL.match(buffer, end).end() < len(buffer) or not read_more():
+                    break
+            pos = end
+            try:
+                element = from_python(element)
+            except RecursionError:
+                raise BuiltInError(f'Invalid JSON in "{path}": element nested too deeply')
+            yield element
+            separator = next_char()
+            if separator == ']':
+                return
+            if separator != ',':
+                invalid("',' or ']'")
+            pos += 1
+
+@builtin("JsonItems")
+def builtin_json_items(path):
+    # The elements of a file holding one JSON array, as a stream.
+    path = path_argument(path)
+    return Stream(f'JsonItems("{path}")', lambda: json_items(path))
+
+STRUCT_CACHE_SIZE = 128
+INT_FORMATS = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+BYTE_ORDERS = {'little': '<', 'big': '>'}
+
+@functools.lru_cache(maxsize=STRUCT_CACHE_SIZE)
+def compile_struct(format):
+    # Like compile_pattern, so the same format in a loop is parsed once.
+    try:
+        return struct.Struct(format)
+    except struct.error as exception:
+        raise BuiltInError(f"Invalid format: {exception}")
+
+def buffer_argument(buffer):
+    if not isinstance(buffer, Buffer):
+        raise BuiltInError("First argument must be buffer")
+    return buffer.view
+
+def offset_argument(offset):
+    if not isinstance(offset, Number) or type(offset.value) is not int or offset.value < 0:
+        raise BuiltInError("Offset must be a non-negative integer")
+    return offset.value
+
+def int_struct(width, order, signed):
+    if not isinstance(width, Number) or width.value not in INT_FORMATS:
+        raise BuiltInError("Width must be 1, 2, 4 or 8")
+    if not isinstance(order, String) or order.value not in BYTE_ORDERS:
+        raise BuiltInError('Byte order must be "little" or "big"')
+    code = INT_FORMATS[width.value]
+    return compile_struct(BYTE_ORDERS[order.value] + (code if signed else code.upper()))
+
+def struct_error(exception):
+    if isinstance(exception, TypeError):
+        return BuiltInError("Buffer is read-only")
+    return BuiltInError(str(exception))
+
+@builtin("Buffer")
+def builtin_buffer(value):
+    # A new writable buffer: size zero bytes, the UTF-8 bytes of a
+    # string, the bytes in a list, or a copy of another buffer.
+    if isinstance(value, Number):
+        if type(value.value) is not int or value.value < 0:
+            raise BuiltInError("Size must be a non-negative integer")
+        return Buffer(memoryview(bytearray(value.value)))
+    if isinstance(value, String):
+        return Buffer(memoryview(bytearray(value.value, 'utf-8')))
+    if isinstance(value, Buffer):
+        return Buffer(memoryview(bytearray(value.view)))
+    if isinstance(value, List):
+        try:
+            return Buffer(memoryview(bytearray(plain_values(value))))
+        except (TypeError, ValueError):
+            raise BuiltInError("Every element must be an integer from 0 to 255")
+    raise BuiltInError("Argument must be size, string, list or buffer")
+
+@builtin("IsBuffer")
+def builtin_is_buffer(value):
+    return Number.true if isinstance(value, Buffer) else Number.false
+
+@builtin("Decode")
+def builtin_decode(buffer, encoding=None):
+    view = buffer_argument(buffer)
+    encoding = 'utf-8' if encoding is None else string_argument(encoding, "Second")
+    try:
+        return str(view, encoding)
+    except (LookupError, UnicodeDecodeError) as exception:
+        raise BuiltInError(f"Cannot decode buffer: {exception}")
+
+@builtin("ReadInt")
+def builtin_read_int(buffer, offset, width=None, order=None):
+    return read_int(buffer, offset, width, order, True)
+
+@builtin("ReadUInt")
+def builtin_read_uint(buffer, offset, width=None, order=None):
+    return read_int(buffer, offset, width, order, False)
+
+def read_int(buffer, offset, width, order, signed):
+    # Width defaults to 4 bytes and order to "little".
+    view = buffer_argument(buffer)
+    offset = offset_argument(offset)
+    layout = int_struct(width or Number(4), order or String('little'), signed)
+    try:
+        return layout.unpack_from(view, offset)[0]
+    except struct.error as exception:
+        raise struct_error(exception)
+
+@builtin("WriteInt")
+def builtin_write_int(buffer, offset, value, width=None, order=None):
+    # Writes value in place; it may be in the signed or unsigned range.
+    view = buffer_argument(buffer)
+    offset = offset_argument(offset)
+    if not isinstance(value, Number) or type(value.value) is not int:
+        raise BuiltInError("Value must be an integer")
+    layout = int_struct(width or Number(4), order or String('little'), value.value < 0)
+    try:
+        layout.pack_into(view, offset, value.value)
+    except (struct.error, TypeError) as exception:
+        raise struct_error(exception)
+
+@builtin("Unpack")
+def builtin_unpack(buffer, format, offset=None):
+    # The values of one record laid out as a struct format, e.g. "<IHd".
+    # Byte strings in the record ("4s") come back as buffers.
+    view = buffer_argument(buffer)
+    layout = compile_struct(string_argument(format, "Second"))
+    try:
+        return layout.unpack_from(view, 0 if offset is None else offset_argument(offset))
+    except struct.error as exception:
+        raise struct_error(exception)
+
+@builtin("UnpackAll")
+def builtin_unpack_all(buffer, format):
+    # Every record in a buffer made of back-to-back records, in one pass
+    # over the bytes; records are lists turned into values only when read.
+    view = buffer_argument(buffer)
+    layout = compile_struct(string_argument(format, "Second"))
+    if layout.size == 0 or len(view) % layout.size:
+        raise BuiltInError(f"Buffer of {len(view)} bytes does not hold whole {layout.size} byte records")
+    return list(layout.iter_unpack(view))
+
+@builtin("Pack")
+def builtin_pack(buffer, format, offset, values):
+    view = buffer_argument(buffer)
+    layout = compile_struct(string_argument(format, "Second"))
+    offset = offset_argument(offset)
+    if not isinstance(values, List):
+        raise BuiltInError("Fourth argument must be list")
+    try:
+        layout.pack_into(view, offset, *plain_values(values))
+    except (struct.error, TypeError) as exception:
+        raise struct_error(exception)
+
+@builtin("ReadBytes")
+def builtin_read_bytes(path):
+    # Reads straight into a new bytearray, without an intermediate bytes.
+    path = path_argument(path)
+    try:
+        with open(path, 'rb') as file:
+            data = bytearray(os.fstat(file.fileno()).st_size)
+            del data[file.readinto(data):]
+    except OSError as exception:
+        raise file_error("read", path, exception)
+    return Buffer(memoryview(data))
+
+@builtin("MapBytes")
+def builtin_map_bytes(path):
+    # A read-only buffer over the file mapped into memory: nothing is read
+    # until a part of it is used, and slices read only their own pages.
+    path = path_argument(path)
+    try:
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return Buffer(memoryview(b''))
+            return Buffer(memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)))
+    except OSError as exception:
+        raise file_error("map", path, exception)
+
+@builtin("WriteBytes")
+def builtin_write_bytes(path, buffer):
+    path = path_argument(path)
+    if not isinstance(buffer, Buffer):
+        raise BuiltInError("Second argument must be buffer")
+    try:
+        with open(path, 'wb') as file:
+            file.write(buffer.view)
+    except OSError as exception:
+        raise file_error("write", path, exception)
+
+@builtin("Range")
+def builtin_range(start, end=None, step=None):
+    bounds = [bound for bound in (start, end, step) if bound is not None]
+    if not all(isinstance(bound, Number) and type(bound.value) is int for bound in bounds):
+        raise BuiltInError("Arguments must be whole numbers")
+    if step is not None and step.value == 0:
+        raise BuiltInError("Step must not be 0")
+    return Range(range(*[bound.value for bound in bounds]))
+
+@builtin("IsRecord")
+def builtin_is_record(value):
+    return Number.true if isinstance(value, Record) else Number.false
+
+@builtin("IsMap")
+def builtin_is_map(value):
+    return Number.true if isinstance(value, Map) else Number.false
+
+def map_argument(map_, key=None):
+    if not isinstance(map_, Map):
+        raise BuiltInError("First argument must be map")
+    if key is None:
+        return None
+    python_key = map_key(key)
+    if python_key is None:
+        raise BuiltInError("Map keys must be numbers or strings")
+    return python_key
+
+@builtin("MapGet")
+def builtin_map_get(map_, key, default=None):
+    value = map_.entries.get(map_argument(map_, key), default)
+    if value is None:
+        raise BuiltInError("Key {} does not exist!".format(repr(key)))
+    return value
+
+@builtin("MapSet")
+def builtin_map_set(map_, key, value):
+    python_key = map_argument(map_, key)
+    map_.writable_entries()[python_key] = value
+
+@builtin("MapHas")
+def builtin_map_has(map_, key):
+    return Number.true if map_argument(map_, key) in map_.entries else Number.false
+
+@builtin("MapDelete")
+def builtin_map_delete(map_, key):
+    python_key = map_argument(map_, key)
+    if python_key not in map_.entries:
+        raise BuiltInError("Key {} does not exist!".format(repr(key)))
+    return map_.writable_entries().pop(python_key)
+
+@builtin("MapSize")
+def builtin_map_size(map_):
+    map_argument(map_)
+    return len(map_.entries)
+
+@builtin("MapKeys")
+def builtin_map_keys(map_):
+    map_argument(map_)
+    return List([from_python(key) for key in map_.entries])
+
+@builtin("MapValues")
+def builtin_map_values(map_):
+    map_argument(map_)
+    return List(list(map_.entries.values()))
+
+@builtin("MapItems")
+def builtin_map_items(map_):
+    map_argument(map_)
+    return List([List([from_python(key), value]) for key, value in map_.entries.items()])
+
+def require_numpy():
+    if numpy is None:
+        raise BuiltInError("NumPy is required for Array values")
+
+def as_array(value):
+    require_numpy()
+    if not isinstance(value, Array):
+        raise BuiltInError("Argument must be an array")
+    return value.data
+
+@builtin("IsArray")
+def builtin_is_array(value):
+    return Number.true if isinstance(value, Array) else Number.false
+
+@builtin("ToArray")
+def builtin_to_array(list_):
+    require_numpy()
+    if not isinstance(list_, List):
+        raise BuiltInError("Argument must be a list")
+    values = [element.value if isinstance(element, Number) else None for element in list_.vector]
+    if None in values:
+        raise BuiltInError("Every element must be a number")
+    return Array(numpy.array(values))
+
+@builtin("ToList")
+def builtin_to_list(array):
+    if isinstance(array, Range):
+        try:
+            return LazyList(list(array.range))
+        except (OverflowError, MemoryError):
+            raise BuiltInError(f"Too many elements ({array.length()}) to make a list")
+    if isinstance(array, (Generator, Stream)):
+        return LazyList(list(array.iterate()))
+    if isinstance(array, Buffer):
+        return LazyList(array.view.tolist())
+    return List([Number(value) for value in as_array(array).tolist()])
+
+@builtin("ArrayRange")
+def builtin_array_range(start, end=None, step=None):
+    require_numpy()
+    bounds = [bound for bound in (start, end, step) if bound is not None]
+    if not all(isinstance(bound, Number) for bound in bounds):
+        raise BuiltInError("Arguments must be numbers")
+    if step is not None and step.value == 0:
+        raise BuiltInError("Step must not be 0")
+    try:
+        return Array(numpy.arange(*[bound.value for bound in bounds]))
+    except (ValueError, ZeroDivisionError) as exception:
+        raise BuiltInError(f"Cannot make range: {exception}")
+
+@builtin("ArrayLen")
+def builtin_array_len(array):
+    # A 0-d array holds one value but has no len().
+    data = as_array(array)
+    return data.shape[0] if data.ndim else 1
+
+@builtin("ArraySum")
+def builtin_array_sum(array):
+    return as_array(array).sum().item()
+
+@builtin("ArrayMean")
+def builtin_array_mean(array):
+    data = as_array(array)
+    if data.size == 0:
+        raise BuiltInError("Array is empty")
+    return data.mean().item()
+
+@builtin("ArrayMin")
+def builtin_array_min(array):
+    data = as_array(array)
+    if data.size == 0:
+        raise BuiltInError("Array is empty")
+    return data.min().item()
+
+@builtin("ArrayMax")
+def builtin_array_max(array):
+    data = as_array(array)
+    if data.size == 0:
+        raise BuiltInError("Array is empty")
+    return data.max().item()
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Profiler
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class ProfilingInterpreter(Interpreter):
+    # An Interpreter that times every node it visits. Pass one to run() as
+    # profiler: while that program runs it also runs every Function body,
+    # and afterwards report() and collapsed_stacks() give the results.
+    # Runs without a profiler use the plain Interpreter and pay nothing.
+    #
+    # Every visit method is wrapped (see visit_method), so nodes visited
+    # through the loop fast paths are timed as well. Time is charged to the
+    # line a node starts on and to the Function whose body is running.
+    # Lists of statements are not charged to a line, as they span many.
+    # Inclusive times count a line or a recursive function once, from its
+    # outermost visit; exclusive times leave out nested lines or calls.
+    # Generator bodies run inside whoever asks for their values, so their
+    # lines are timed but their time goes to the caller's function.
+    clock = time.perf_counter
 
+    def __init__(self):
+        self.function_bodies = {}     # body node -> label
+        self.reset()
+
+    def reset(self):
+        # Clears the counts but keeps the functions defined so far, so one
+        # profiler can time run after run, e.g. line after line in the shell.
+        self.total = 0.0
+        self.lines = {}               # (file, line) -> [hits, inclusive, exclusive]
+        self.line_texts = {}          # (file, line) -> the program text it is in
+        self.functions = {}           # label -> [calls, inclusive, exclusive]
+        self.stacks = {}              # tuple of labels -> exclusive time
+        self.active_lines = {}
+        self.active_functions = {}
+        self.node_times = []          # time spent in nested nodes, per open node
+        self.call_stack = ['<program>']
+        self.call_times = [0.0]       # time spent in nested calls, per open call
+
+    @classmethod
+    def visit_method(cls, node_type):
+        method = cls.visit_methods.get(node_type)
+        if method is None:
+            method = super().visit_method(node_type)
+            method = cls.timed_block(method) if node_type is ListNode else cls.timed(method)
+            cls.visit_methods[node_type] = method
+        return method
+
+    @staticmethod
+    def timed(method):
+        def visit(self, node, context):
+            pos = node.start_pos
+            line = (pos.file_name, pos.line + 1)
+            outermost_line = not self.active_lines.get(line)
+            if outermost_line:
+                self.active_lines[line] = 1
+                if line not in self.line_texts:
+                    self.line_texts[line] = pos.file_text
+            else:
+                self.active_lines[line] += 1
+            function = self.function_bodies.get(node)
+            if function is not None:
+                self.enter_function(function)
+            self.node_times.append(0.0)
+            start = self.clock()
+            try:
+                return method(self, node, context)
+            finally:
+                elapsed = self.clock() - start
+                nested = self.node_times.pop()
+                if self.node_times:
+                    self.node_times[-1] += elapsed
+                stats = self.lines.get(line)
+                if stats is None:
+                    stats = self.lines[line] = [0, 0.0, 0.0]
+                stats[2] += elapsed - nested
+                self.active_lines[line] -= 1
+                if outermost_line:
+                    stats[0] += 1
+                    stats[1] += elapsed
+                if function is not None:
+                    self.leave_function(function, elapsed)
+        return visit
+
+    @staticmethod
+    def timed_block(method):
+        # Only watches for function bodies; the time of the statements
+        # goes to the node the list is in.
+        def visit(self, node, context):
+            function = self.function_bodies.get(node)
+            if function is None:
+                return method(self, node, context)
+            self.enter_function(function)
+            start = self.clock()
+            try:
+                return method(self, node, context)
+            finally:
+                self.leave_function(function, self.clock() - start)
+        return visit
+
+    def enter_function(self, function):
+        self.active_functions[function] = self.active_functions.get(function, 0) + 1
+        self.call_stack.append(function)
+        self.call_times.append(0.0)
+
+    def leave_function(self, function, elapsed):
+        exclusive = elapsed - self.call_times.pop()
+        self.call_times[-1] += elapsed
+        stack = tuple(self.call_stack)
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + exclusive
+        self.call_stack.pop()
+        stats = self.functions.get(function)
+        if stats is None:
+            stats = self.functions[function] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[2] += exclusive
+        self.active_functions[function] -= 1
+        if not self.active_functions[function]:
+            stats[1] += elapsed
+
+    def visit_FunctionDefinitionNode(self, node, context):
+        # Remembers the body so that visiting it later counts as a call.
+        if node.func_body_node not in self.function_bodies:
+            name = node.func_name_token.value if node.func_name_token else '<anonymous>'
+            self.function_bodies[node.func_body_node] = f'{name} ({node.start_pos.file_name}:{node.start_pos.line + 1})'
+        return super().visit_FunctionDefinitionNode(node, context)
+
+    def profile(self, node, context):
+        # Visits node with every Function (and generator) body also run by
+        # this interpreter, then puts the shared interpreters back.
+        interpreter = Function.interpreter
+        Function.interpreter = self
+        Function.generator_interpreter.interpreter = self
+        start = self.clock()
+        try:
+            return self.visit(node, context)
+        finally:
+            elapsed = self.clock() - start
+            self.total += elapsed
+            stack = ('<program>',)
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + elapsed - self.call_times[0]
+            self.call_times[0] = 0.0
+            Function.interpreter = interpreter
+            Function.generator_interpreter.interpreter = interpreter
+
+    def source_line(self, line):
+        text = self.line_texts.get(line)
+        if text is None:
+            return ''
+        lines = text.split('\n')
+        return lines[line[1] - 1].strip() if line[1] <= len(lines) else ''
+
+    def report(self, limit=20):
+        # The functions and lines that took the most time of their own,
+        # as text.
+        rows = [f'Profile: {self.total:.3f} s', '']
+        rows.append(f'{"Function":<40} {"calls":>10} {"inclusive":>11} {"exclusive":>11}')
+        functions = sorted(self.functions.items(), key=lambda item: item[1][2], reverse=True)
+        for label, (calls, inclusive, exclusive) in functions[:limit]:
+            rows.append(f'{label[:40]:<40} {calls:>10,} {inclusive:>9.3f} s {exclusive:>9.3f} s')
+        rows.append('')
+        rows.append(f'{"Line":<40} {"hits":>10} {"inclusive":>11} {"exclusive":>11}')
+        lines = sorted(self.lines.items(), key=lambda item: item[1][2], reverse=True)
+        for line, (hits, inclusive, exclusive) in lines[:limit]:
+            label = f'{line[0]}:{line[1]}  {self.source_line(line)}'
+            rows.append(f'{label[:40]:<40} {hits:>10,} {inclusive:>9.3f} s {exclusive:>9.3f} s')
+        return '\n'.join(rows)
+
+    def collapsed_stacks(self):
+        # One "<program>;caller;callee microseconds" line per call stack,
+        # the format flamegraph.pl and speedscope read.
+        return '\n'.join(
+            f"{';'.join(stack)} {round(seconds * 1_000_000)}"
+            for stack, seconds in self.stacks.items() if seconds > 0
+        ) + '\n'
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.collapsed_stacks())
+
+class SamplingProfiler:
+    # Looks at what the program is doing every interval seconds from a
+    # background thread instead of timing every node, so the program runs
+    # at close to full speed. Pass one to run() as profiler, or start()
+    # and stop() it (or use it in a with block) around any number of runs
+    # on the same thread, e.g. for as long as a service is up.
+    #
+    # A sample walks the Python stack of the profiled thread. Interpreter
+    # frames hold the node being visited and its context, and the
+    # innermost frame of each context gives that function's current line.
+    # A Context's parent is where its function was defined, not who called
+    # it, so the order of calls comes from the Python stack instead.
+    #
+    # Samples can only be taken when the program thread lets go of the GIL,
+    # which it does every sys.getswitchinterval() (5 ms by default), so
+    # shorter intervals do not give more samples.
+    visit_codes = frozenset(
+        method.__code__
+        for cls in (Interpreter, GeneratorInterpreter)
+        for name, method in vars(cls).items()
+        if name.startswith(('visit', 'run')) and inspect.isfunction(method)
+    )
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.thread = None
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self.elapsed = 0.0
+        self.lines = {}               # (file, line) -> [own samples, samples]
+        self.line_texts = {}
+        self.functions = {}           # label -> [own samples, samples]
+        self.stacks = {}              # tuple of labels -> samples
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.target = threading.get_ident()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.sample_loop, name='naive-sampler', daemon=True)
+        self.started = time.perf_counter()
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is None:
+            return self
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+        self.elapsed += time.perf_counter() - self.started
+        return self
 
-def run(file_name, text):
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exception):
+        self.stop()
+
+    def profile(self, node, context):
+        self.start()
+        try:
+            return Interpreter().visit(node, context)
+        finally:
+            self.stop()
+
+    def sample_loop(self):
+        current_frames = sys._current_frames
+        while not self.stopping.wait(self.interval):
+            frame = current_frames().get(self.target)
+            if frame is not None:
+                self.sample(frame)
+
+    def sample(self, frame):
+        # (label, position) for every function on the stack, innermost first.
+        calls = []
+        context = None
+        visit_codes = self.visit_codes
+        while frame is not None:
+            if frame.f_code in visit_codes:
+                names = frame.f_locals
+                frame_context = names.get('context')
+                if frame_context is not context and isinstance(frame_context, Context):
+                    context = frame_context
+                    calls.append((context.display_name, names['node'].start_pos))
+            frame = frame.f_back
+        if not calls:
+            return
+
+        self.samples += 1
+        stack = tuple(label for label, pos in reversed(calls))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        seen_functions = set()
+        seen_lines = set()
+        for index, (label, pos) in enumerate(calls):
+            line = (pos.file_name, pos.line + 1)
+            if line not in self.line_texts:
+                self.line_texts[line] = pos.file_text
+            for table, key, seen in ((self.functions, label, seen_functions), (self.lines, line, seen_lines)):
+                counts = table.get(key)
+                if counts is None:
+                    counts = table[key] = [0, 0]
+                if index == 0:
+                    counts[0] += 1
+                if key not in seen:
+                    seen.add(key)
+                    counts[1] += 1
+
+    source_line = ProfilingInterpreter.source_line
+
+    def report(self, limit=20):
+        # The functions and lines the most samples were taken in, as text.
+        samples = self.samples or 1
+        rows = [f'Samples: {self.samples:,} in {self.elapsed:.3f} s, every {self.interval * 1000:g} ms', '']
+        rows.append(f'{"Function":<40} {"own":>10} {"own %":>7} {"total %":>8}')
+        functions = sorted(self.functions.items(), key=lambda item: item[1][0], reverse=True)
+        for label, (own, total) in functions[:limit]:
+            rows.append(f'{label[:40]:<40} {own:>10,} {own / samples:>7.1%} {total / samples:>8.1%}')
+        rows.append('')
+        rows.append(f'{"Line":<40} {"own":>10} {"own %":>7} {"total %":>8}')
+        lines = sorted(self.lines.items(), key=lambda item: item[1][0], reverse=True)
+        for line, (own, total) in lines[:limit]:
+            label = f'{line[0]}:{line[1]}  {self.source_line(line)}'
+            rows.append(f'{label[:40]:<40} {own:>10,} {own / samples:>7.1%} {total / samples:>8.1%}')
+        return '\n'.join(rows)
+
+    def collapsed_stacks(self):
+        # Sample counts per call stack, in the same format as
+        # ProfilingInterpreter.collapsed_stacks.
+        return '\n'.join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.items()) + '\n'
+
+    write_collapsed = ProfilingInterpreter.write_collapsed
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Run
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def run(file_name, text, bindings=None, profiler=None):
     # Generate the tokens
     lexer = Lexer(file_name, text)
     tokens, error = lexer.generate_tokens()
@@ -2022,9 +4832,36 @@ def run(file_name, text):
     if ast.error: return None, ast.error
 
     #interpreting
-    interpreter = Interpreter()
     context = Context('<program>')
-    context.symbol_table = global_symbol_table
-    result = interpreter.visit(ast.node, context)
+    if bindings is None:
+        context.symbol_table = global_symbol_table
+    else:
+        # Bindings live in their own table so they do not leak into
+        # later runs.
+        context.symbol_table = SymbolTable(global_symbol_table)
+        for name, value in bindings.items():
+            context.symbol_table.set(name, from_python(value))
+    if profiler is None:
+        result = Interpreter().visit(ast.node, context)
+    else:
+        # A ProfilingInterpreter or a SamplingProfiler.
+        result = profiler.profile(ast.node, context)
 
     return result.value, result.error
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Embedding
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class NaiveError(Exception):
+    def __init__(self, error):
+        super().__init__(error.as_string())
+        self.error = error
+
+def evaluate(text, bindings=None, file_name='<embedded>'):
+    # Runs text with the Python objects in bindings available by name and
+    # returns the value of the last statement as a Python object. Lists,
+    # NumPy arrays and buffers are shared with the program, not copied.
+    result, error = run(file_name, text, bindings)
+    if error:
+        raise NaiveError(error)
+    return to_python(result.vector[len(result.vector) - 1])
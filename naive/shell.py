@@ -2,6 +2,16 @@ import sys
 import naive
 import os
 
+# python shell.py --profile prints where the time went after every line;
+# --profile=<path> also writes the collapsed stacks for a flame graph.
+# --sample and --sample=<path> do the same with the sampling profiler.
+profile = next((arg for arg in sys.argv[1:] if arg.startswith(('--profile', '--sample'))), None)
+# One profiler for the whole session: functions are recognised from where
+# they were defined, which may be an earlier line.
+profiler = None
+if profile:
+    profiler = naive.SamplingProfiler() if profile.startswith('--sample') else naive.ProfilingInterpreter()
+
 while (True):
     text = input("Naive >> ")
     if text.strip() == "":
@@ -13,10 +23,16 @@ while (True):
         os.system('cls')
     
     else:
-        result, error = naive.run('sys.stdin', text)
+        if profiler:
+            profiler.reset()
+        result, error = naive.run('sys.stdin', text, profiler=profiler)
         if (error): print(error.as_string())
         elif result:
             if len(result.elements) == 1:
                 print(repr(result.elements[0]))
             else:
-                print(repr(result))
\ No newline at end of file
+                print(repr(result))
+        if profiler:
+            print(profiler.report())
+            if '=' in profile:
+                profiler.write_collapsed(profile.split('=', 1)[1])
\ No newline at end of file